@@ -0,0 +1,123 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Cache Hit Benchmark
+
+Times a full parse of a synthetic catalog against loading it back from
+its compiled snapshot (use_cache=True) in the same process, and reports
+the speedup. Each hit is the best of --repeat runs. With --min-ratio the
+script exits with status 1 if any speedup falls below it, so it can
+guard the cache-hit path against regressions.
+
+Usage:
+    python benchmarks/bench_catalog_cache.py --sizes 200000 --repeat 3 --min-ratio 6
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from benchmarks.bench_loaders import generate_quest_file, generate_item_file
+
+DEFAULT_SIZES = (10000, 200000)
+
+LOADERS = {
+    'quest': (generate_quest_file, game_data.load_quests),
+    'item': (generate_item_file, game_data.load_items),
+}
+
+def measure_cache_hit(kind, filename, repeat=3):
+    """
+    Time one parse and the best of repeat snapshot loads of filename
+
+    The first use_cache=True load writes the snapshot and is not timed.
+
+    Returns: Dictionary with parse_seconds, hit_seconds and speedup
+    Raises: AssertionError if a snapshot load differs from the parse
+    """
+    loader = LOADERS[kind][1]
+    cache_file = filename + game_data.CACHE_SUFFIX
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+
+    start = time.perf_counter()
+    parsed = loader(filename)
+    parse_seconds = time.perf_counter() - start
+
+    loader(filename, use_cache=True)
+    hit_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cached = loader(filename, use_cache=True)
+        hit_times.append(time.perf_counter() - start)
+    assert cached == parsed, f"{kind} snapshot does not match the parsed catalog"
+
+    return {
+        'kind': kind,
+        'records': len(parsed),
+        'parse_seconds': parse_seconds,
+        'hit_seconds': min(hit_times),
+        'speedup': parse_seconds / min(hit_times),
+    }
+
+def run_benchmarks(sizes, data_dir, repeat=3):
+    """Generate each catalog size and measure its cache hits"""
+    results = []
+    for size in sizes:
+        for kind, (generate, _) in LOADERS.items():
+            filename = os.path.join(data_dir, f"{kind}s_{size}.txt")
+            generate(filename, size)
+            result = measure_cache_hit(kind, filename, repeat)
+            results.append(result)
+            print(f"{kind:<5} {size:>8} parse {result['parse_seconds']:7.3f}s "
+                  f"hit {result['hit_seconds']:7.3f}s "
+                  f"speedup {result['speedup']:5.1f}x", file=sys.stderr)
+    return results
+
+def main(argv=None):
+    """Parse arguments, run the benchmark and check --min-ratio"""
+    parser = argparse.ArgumentParser(description="Benchmark catalog cache hits")
+    parser.add_argument('--sizes', default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated record counts")
+    parser.add_argument('--repeat', type=int, default=3, help="Cache hits to time (best is kept)")
+    parser.add_argument('--min-ratio', type=float,
+                        help="Exit with status 1 if any speedup is below this")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    parser.add_argument('--data-dir', help="Where to write generated catalogs")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        results = run_benchmarks(sizes, args.data_dir, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_benchmarks(sizes, data_dir, args.repeat)
+
+    report = {
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.min_ratio is not None:
+        slow = [result for result in results if result['speedup'] < args.min_ratio]
+        for result in slow:
+            print(f"{result['kind']} x{result['records']}: speedup {result['speedup']:.1f}x "
+                  f"is below --min-ratio {args.min_ratio}", file=sys.stderr)
+        return 1 if slow else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Loader Benchmark
+
+Generates synthetic quests.txt/items.txt catalogs and times each loader
+stage on them. Every (catalog, size, stage) measurement runs in a fresh
+Python process so that its peak RSS is not polluted by earlier runs.
+
+Stages are cumulative; each includes the work of the ones before it:
+    read      - read the file line by line
+    split     - group lines into blank-line separated blocks
+    parse     - parse_quest_block / parse_item_block on every block
+    validate  - validate_quest_data / validate_item_data on every block
+    load      - full load_quests / load_items (records + catalog)
+
+Usage:
+    python benchmarks/bench_loaders.py --sizes 1000,10000,100000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+try:
+    import resource
+except ImportError:
+    # Peak RSS is not reported on platforms without the resource module
+    resource = None
+
+STAGES = ('read', 'split', 'parse', 'validate', 'load')
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Effect stats that make sense for each item type
+TYPE_EFFECT_STATS = {
+    'weapon': ('strength', 'magic'),
+    'armor': ('max_health', 'magic'),
+    'consumable': ('health', 'strength', 'magic'),
+}
+
+# ============================================================================
+# SYNTHETIC CATALOG GENERATOR
+# ============================================================================
+
+def generate_quest_file(filename, count, seed=163):
+    """
+    Write count synthetic quests to filename
+
+    Quests come in prerequisite chains of 1-8 quests. Required level,
+    XP and gold rise along each chain, like the hand-written data.
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w') as f:
+        previous_id = "NONE"
+        level = 1
+        chain_left = 0
+        for index in range(count):
+            if chain_left == 0:
+                chain_left = rng.randint(1, 8)
+                previous_id = "NONE"
+                level = rng.randint(1, 20)
+            quest_id = f"quest_{index}"
+            f.write(
+                f"QUEST_ID: {quest_id}\n"
+                f"TITLE: Quest {index}\n"
+                f"DESCRIPTION: A generated quest for level {level} heroes, number {index}.\n"
+                f"REWARD_XP: {level * rng.randint(40, 60)}\n"
+                f"REWARD_GOLD: {level * rng.randint(20, 40)}\n"
+                f"REQUIRED_LEVEL: {level}\n"
+                f"PREREQUISITE: {previous_id}\n\n"
+            )
+            previous_id = quest_id
+            level += rng.randint(0, 2)
+            chain_left -= 1
+
+def generate_item_file(filename, count, seed=163):
+    """
+    Write count synthetic items to filename
+
+    Types are spread evenly, each with effect stats suited to it, and
+    about one item in ten has a multi-stat effect.
+    """
+    rng = random.Random(seed)
+    item_types = list(TYPE_EFFECT_STATS)
+    with open(filename, 'w') as f:
+        for index in range(count):
+            item_type = item_types[index % len(item_types)]
+            stats = TYPE_EFFECT_STATS[item_type]
+            effect_count = 2 if rng.random() < 0.1 else 1
+            effect = ",".join(f"{stat}:{rng.randint(1, 50)}"
+                              for stat in rng.sample(stats, effect_count))
+            f.write(
+                f"ITEM_ID: item_{index}\n"
+                f"NAME: Item {index}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {effect}\n"
+                f"COST: {rng.randint(5, 1000)}\n"
+                f"DESCRIPTION: A generated {item_type}, number {index}.\n\n"
+            )
+
+# ============================================================================
+# STAGE MEASUREMENT
+# ============================================================================
+
+def run_stage(kind, filename, stage):
+    """
+    Run one loader stage on filename in this process
+
+    Returns: Dictionary with seconds, records and peak_rss_kb
+    """
+    label = "Quest" if kind == 'quest' else "Item"
+    parse_block = game_data.parse_quest_block if kind == 'quest' else game_data.parse_item_block
+    validate = game_data.validate_quest_data if kind == 'quest' else game_data.validate_item_data
+
+    start = time.perf_counter()
+    records = 0
+    if stage == 'read':
+        with open(filename, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    records += 1
+    elif stage == 'load':
+        loader = game_data.load_quests if kind == 'quest' else game_data.load_items
+        records = len(loader(filename))
+    else:
+        for line_number, lines in game_data._iter_data_blocks(filename, label):
+            if stage != 'split':
+                data = parse_block(lines)
+                if stage == 'validate':
+                    validate(data)
+            records += 1
+    seconds = time.perf_counter() - start
+
+    peak_rss_kb = None
+    if resource is not None:
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'seconds': seconds, 'records': records, 'peak_rss_kb': peak_rss_kb}
+
+def measure_stage(kind, filename, stage):
+    """Run one stage in a fresh interpreter and return its measurements"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--stage', stage,
+         '--kind', kind, '--file', filename],
+        capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    seconds = result['seconds']
+    result['records_per_second'] = result['records'] / seconds if seconds else None
+    return result
+
+def run_benchmarks(sizes, data_dir, kinds=('quest', 'item')):
+    """
+    Generate catalogs of each size and measure every stage on them
+
+    Returns: List of result dictionaries, one per (kind, size, stage)
+    """
+    results = []
+    for size in sizes:
+        for kind in kinds:
+            filename = os.path.join(data_dir, f"{kind}s_{size}.txt")
+            if kind == 'quest':
+                generate_quest_file(filename, size)
+            else:
+                generate_item_file(filename, size)
+            for stage in STAGES:
+                result = measure_stage(kind, filename, stage)
+                result.update({'kind': kind, 'size': size, 'stage': stage,
+                               'file_bytes': os.path.getsize(filename)})
+                results.append(result)
+                print(f"{kind:<6} {size:>9} {stage:<9} "
+                      f"{result['seconds']:8.3f}s "
+                      f"{result['records_per_second'] or 0:12.0f} rec/s "
+                      f"peak RSS {result['peak_rss_kb']} KB", file=sys.stderr)
+            os.remove(filename)
+    return results
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """Parse arguments and run the benchmark (or a single worker stage)"""
+    parser = argparse.ArgumentParser(description="Benchmark the catalog loaders")
+    parser.add_argument('--sizes', default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated record counts (1k to 10M)")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    parser.add_argument('--data-dir', help="Where to write generated catalogs")
+    parser.add_argument('--stage', choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument('--kind', choices=('quest', 'item'), help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stage:
+        print(json.dumps(run_stage(args.kind, args.file, args.stage)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        results = run_benchmarks(sizes, args.data_dir)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_benchmarks(sizes, data_dir)
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
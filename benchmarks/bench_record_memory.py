@@ -0,0 +1,77 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Record Memory Benchmark
+
+Compares the memory used per catalog record by plain dictionaries (what
+the loaders used to return) and by the compact QuestRecord/ItemRecord
+types.
+
+Usage: python benchmarks/bench_record_memory.py [record_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+def make_quest_lines(index):
+    """Build the text lines of one synthetic quest block"""
+    return [
+        f"QUEST_ID: quest_{index}",
+        f"TITLE: Quest {index}",
+        f"DESCRIPTION: Synthetic quest number {index}",
+        f"REWARD_XP: {50 + index % 500}",
+        f"REWARD_GOLD: {25 + index % 250}",
+        f"REQUIRED_LEVEL: {1 + index % 50}",
+        f"PREREQUISITE: {'NONE' if index == 0 else f'quest_{index - 1}'}",
+    ]
+
+def make_item_lines(index):
+    """Build the text lines of one synthetic item block"""
+    item_type = ('weapon', 'armor', 'consumable')[index % 3]
+    return [
+        f"ITEM_ID: item_{index}",
+        f"NAME: Item {index}",
+        f"TYPE: {item_type}",
+        f"EFFECT: {('strength', 'max_health', 'health')[index % 3]}:{1 + index % 20}",
+        f"COST: {10 + index % 990}",
+        f"DESCRIPTION: Synthetic {item_type} number {index}",
+    ]
+
+def measure(build, count):
+    """
+    Measure the memory retained by building count records
+
+    Returns: Bytes per record
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / count
+
+def main(count=100000):
+    """Print bytes per record for dicts and compact records"""
+    quest_blocks = [make_quest_lines(index) for index in range(count)]
+    item_blocks = [make_item_lines(index) for index in range(count)]
+
+    results = [
+        ("quest dict", measure(lambda i: game_data.parse_quest_block(quest_blocks[i]), count)),
+        ("QuestRecord", measure(lambda i: game_data.QuestRecord.from_dict(
+            game_data.parse_quest_block(quest_blocks[i])), count)),
+        ("item dict", measure(lambda i: game_data.parse_item_block(item_blocks[i]), count)),
+        ("ItemRecord", measure(lambda i: game_data.ItemRecord.from_dict(
+            game_data.parse_item_block(item_blocks[i])), count)),
+    ]
+
+    print(f"=== RECORD MEMORY ({count} records) ===")
+    for label, per_record in results:
+        print(f"{label:<12} {per_record:8.1f} bytes/record")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,102 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Format Benchmark
+
+Compares the text and binary save formats on synthetic characters:
+bytes per save, serialize time and parse time (deserialize_character,
+including validation).
+
+Usage:
+    python benchmarks/bench_save_formats.py --count 10000 --inventory 20 --output results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+CLASSES = ('Warrior', 'Mage', 'Rogue', 'Cleric')
+
+def generate_characters(count, inventory_size=10, seed=163):
+    """Build count characters with inventories and quest logs of about inventory_size"""
+    rng = random.Random(seed)
+    characters = []
+    for index in range(count):
+        character = character_manager.create_character(f"Hero{index}", rng.choice(CLASSES))
+        character['level'] = rng.randint(1, 50)
+        character['experience'] = rng.randint(0, 5000)
+        character['gold'] = rng.randint(0, 100000)
+        character['inventory'] = [f"item_{rng.randint(0, 999)}" for _ in range(inventory_size)]
+        character['active_quests'] = [f"quest_{rng.randint(0, 999)}"
+                                      for _ in range(inventory_size // 4)]
+        character['completed_quests'] = [f"quest_{rng.randint(0, 999)}"
+                                         for _ in range(inventory_size)]
+        characters.append(character)
+    return characters
+
+def measure_format(characters, save_format, repeat=3):
+    """
+    Time serializing and parsing every character in save_format
+
+    Returns: Dictionary with bytes_per_save and the best of repeat runs
+             for serialize_seconds and parse_seconds
+    """
+    serialize_times = []
+    parse_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        saves = [character_manager.serialize_character(character, save_format)
+                 for character in characters]
+        serialize_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for data in saves:
+            character_manager.deserialize_character(data)
+        parse_times.append(time.perf_counter() - start)
+
+    return {
+        'format': save_format,
+        'bytes_per_save': sum(len(data) for data in saves) / len(saves),
+        'serialize_seconds': min(serialize_times),
+        'parse_seconds': min(parse_times),
+        'saves_per_second': len(saves) / min(parse_times),
+    }
+
+def main(argv=None):
+    """Parse arguments and compare the save formats"""
+    parser = argparse.ArgumentParser(description="Benchmark the save formats")
+    parser.add_argument('--count', type=int, default=10000, help="Characters to generate")
+    parser.add_argument('--inventory', type=int, default=10, help="Items per inventory")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    characters = generate_characters(args.count, args.inventory)
+    results = []
+    for save_format in character_manager.SAVE_FORMATS:
+        result = measure_format(characters, save_format)
+        results.append(result)
+        print(f"{save_format:<7} {result['bytes_per_save']:8.1f} B/save "
+              f"serialize {result['serialize_seconds']:7.3f}s "
+              f"parse {result['parse_seconds']:7.3f}s", file=sys.stderr)
+
+    report = {
+        'python': sys.version.split()[0],
+        'count': args.count,
+        'inventory': args.inventory,
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
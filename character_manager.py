@@ -9,7 +9,23 @@ AI Usage: [Document any AI assistance used]
 This module handles character creation, loading, and saving.
 """
 
+import abc
+import atexit
+import copy
+import hashlib
+import io
+import math
 import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from inventory_system import Inventory, item_counts
+from game_data import VALID_EFFECT_STATS
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -90,7 +106,7 @@ def create_character(name, character_class):
         'magic': character_stats['magic'],
         'experience': 0,
         'gold': 100,
-        'inventory': [],
+        'inventory': Inventory(),
         'active_quests': [],
         'completed_quests': []
     }
@@ -98,53 +114,203 @@ def create_character(name, character_class):
         raise CharacterDeadError(f"Character {name} is dead upon creation.")
     return character
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", fsync=False, backend=None,
+                   force=False):
     """
     Saves character data to a file in a clean, consistent format.
-    Returns True if successful.
-    Raises PermissionError or IOError for file issues.
-    """
 
-    # Ensure directory exists
-    os.makedirs(save_directory, exist_ok=True)
+    The whole save is built in memory, written to a temporary file in
+    one call and then moved over the old save with os.replace, so a
+    crash mid-save never leaves a truncated file behind.
 
-    # Build file path
-    file_path = os.path.join(save_directory, f"{character['name']}_save.txt")
+    Nothing is written if no saved field changed since the character was
+    last saved or loaded through the same backend (see get_dirty_fields).
 
-    try:
-        # Convert lists into comma-separated strings safely
-        inventory_str = ",".join(character.get('inventory', []))
-        active_quests_str = ",".join(character.get('active_quests', []))
-        completed_quests_str = ",".join(character.get('completed_quests', []))
-
-        # Write file contents
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(f"NAME : {character['name']}\n")
-            f.write(f"CLASS : {character['class']}\n")
-            f.write(f"LEVEL : {character['level']}\n")
-            f.write(f"HEALTH : {character['health']}\n")
-            f.write(f"MAX_HEALTH : {character['max_health']}\n")
-            f.write(f"STRENGTH : {character['strength']}\n")
-            f.write(f"MAGIC : {character['magic']}\n")
-            f.write(f"EXPERIENCE : {character['experience']}\n")
-            f.write(f"GOLD : {character['gold']}\n")
-            f.write(f"INVENTORY : {inventory_str}\n")
-            f.write(f"ACTIVE_QUESTS : {active_quests_str}\n")
-            f.write(f"COMPLETED_QUESTS : {completed_quests_str}\n")
+    Args:
+        character: Character dictionary
+        save_directory: Directory containing save files
+        fsync: If True, flush the file and directory to disk before
+               returning (slower, but survives power loss)
+        backend: Storage backend to use instead of get_storage_backend()
+        force: Write even if nothing changed
 
+    Returns True if successful (including when the save was skipped).
+    Raises PermissionError or IOError for file issues.
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    if not force and not backend.get_dirty_fields(character):
+        return True
+    try:
+        _cache_discard(backend, character['name'])
+        backend.save(character, fsync=fsync)
+        # Again, so a load that read the old save meanwhile won't cache it
+        _cache_discard(backend, character['name'])
+        backend.mark_clean(character)
         return True
 
     except (PermissionError, IOError):
         # Re-raise so game logic can catch and display error
         raise
 
-def load_character(character_name, save_directory="data/save_games"):
+def save_characters(characters, save_directory="data/save_games", fsync=True, backend=None,
+                    force=False):
+    """
+    Save many characters, syncing the save directory only once
+
+    Each save is atomic like save_character. With fsync=True every file
+    is flushed to disk, but the directory entry updates are flushed with
+    a single directory fsync at the end of the batch. Unchanged
+    characters are skipped unless force is True.
+
+    Args:
+        characters: Iterable of character dictionaries
+        save_directory: Directory containing save files
+        fsync: Flush the saves to disk before returning
+        backend: Storage backend to use instead of get_storage_backend()
+        force: Write every character even if nothing changed
+
+    Returns: Number of characters written
+    Raises PermissionError or IOError for file issues (characters
+           before the failing one are already saved)
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    if force:
+        dirty = list(characters)
+    else:
+        dirty = [character for character in characters if backend.get_dirty_fields(character)]
+    for character in dirty:
+        _cache_discard(backend, character['name'])
+    saved = backend.save_many(dirty, fsync=fsync)
+    for character in dirty:
+        _cache_discard(backend, character['name'])
+        backend.mark_clean(character)
+    return saved
+
+def get_dirty_fields(character, save_directory="data/save_games", backend=None):
+    """
+    Get the saved fields changed since the character was last saved or
+    loaded through the backend
+
+    Returns: List of field names (every field if the backend has not
+             seen this character yet)
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    return backend.get_dirty_fields(character)
+
+# Character fields written to a save, in save file order
+SAVED_FIELDS = ('name', 'class', 'level', 'health', 'max_health', 'strength', 'magic',
+                'experience', 'gold', 'inventory', 'active_quests', 'completed_quests',
+                'equipped_weapon', 'equipped_armor', 'modifiers')
+
+# Characters each backend remembers for dirty tracking; saving one it
+# has forgotten simply writes it again
+PERSISTED_LIMIT = 10000
+# Bytes of digest kept per saved field
+_FIELD_DIGEST_SIZE = 8
+
+def _field_digests(character):
+    """
+    Fingerprint the saved fields of a character for dirty tracking
+
+    Each field is reduced to a short digest of its repr, so a backend
+    keeps about 120 bytes per character instead of a copy of it.
+    Inventories are fingerprinted by item counts and dictionaries by
+    their sorted items, since == ignores their order.
+
+    Returns: bytes, one digest per field in SAVED_FIELDS order
+    """
+    digests = []
+    for field in SAVED_FIELDS:
+        value = character.get(field)
+        if field == 'inventory' and value is not None:
+            value = sorted(item_counts(value).items())
+        elif isinstance(value, dict):
+            value = sorted(value.items())
+        digests.append(hashlib.blake2b(repr(value).encode('utf-8'),
+                                       digest_size=_FIELD_DIGEST_SIZE).digest())
+    return b"".join(digests)
+
+# Binary saves start with this magic and a format version byte; text
+# saves always start with "NAME"
+BINARY_SAVE_MAGIC = b"QCSB"
+BINARY_SAVE_VERSION = 2
+SAVE_FORMATS = ('text', 'binary')
+
+_BINARY_HEADER = struct.Struct('<4sB')
+_BINARY_STRING = struct.Struct('<H')
+# level, health, max_health, strength, magic, experience, gold
+_BINARY_STATS = struct.Struct('<7q')
+# item count, byte length of the NUL-joined items
+_BINARY_LIST = struct.Struct('<HI')
+_BINARY_STAT_FIELDS = ('level', 'health', 'max_health', 'strength', 'magic', 'experience', 'gold')
+_BINARY_LIST_FIELDS = ('inventory', 'active_quests', 'completed_quests')
+# Added in version 2, after the lists
+_BINARY_EQUIPMENT_FIELDS = ('equipped_weapon', 'equipped_armor')
+
+# Fields peek_character reads from the start of a save
+SUMMARY_FIELDS = ('name', 'class', 'level', 'gold')
+
+# A save directory changed less than this long before its stamp was
+# taken may change again within the same mtime tick
+RACY_STAMP_NS = 20_000_000
+
+def serialize_character(character, save_format="text"):
+    """
+    Build the complete save file contents for a character
+
+    Args:
+        character: Character dictionary
+        save_format: 'text' (NAME : value lines) or 'binary'
+
+    Returns: Save file contents as bytes
+    """
+    if save_format == "binary":
+        return _serialize_binary(character)
+    if save_format != "text":
+        raise ValueError(f"Unknown save format: {save_format}")
+    # Convert lists into comma-separated strings safely
+    inventory_str = ",".join(encode_inventory(character.get('inventory', [])))
+    active_quests_str = ",".join(character.get('active_quests', []))
+    completed_quests_str = ",".join(character.get('completed_quests', []))
+    # Equipment and modifiers are only written once there are any, so
+    # plain characters keep the original save layout
+    equipment_lines = "".join(
+        f"{field.upper()} : {character[field]}\n"
+        for field in ('equipped_weapon', 'equipped_armor') if character.get(field))
+    if character.get('modifiers'):
+        equipment_lines += f"MODIFIERS : {';'.join(encode_modifiers(character['modifiers']))}\n"
+
+    return (
+        f"NAME : {character['name']}\n"
+        f"CLASS : {character['class']}\n"
+        f"LEVEL : {character['level']}\n"
+        f"HEALTH : {character['health']}\n"
+        f"MAX_HEALTH : {character['max_health']}\n"
+        f"STRENGTH : {character['strength']}\n"
+        f"MAGIC : {character['magic']}\n"
+        f"EXPERIENCE : {character['experience']}\n"
+        f"GOLD : {character['gold']}\n"
+        f"INVENTORY : {inventory_str}\n"
+        f"ACTIVE_QUESTS : {active_quests_str}\n"
+        f"COMPLETED_QUESTS : {completed_quests_str}\n"
+        f"{equipment_lines}"
+    ).encode('utf-8')
+
+def load_character(character_name, save_directory="data/save_games", backend=None):
     """
     Load character from save file
+
+    If the character cache is enabled (enable_character_cache), recently
+    loaded characters are served from memory; every call still returns
+    its own copy.
     
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
+        backend: Storage backend to use instead of get_storage_backend()
     
     Returns: Character dictionary
     Raises: 
@@ -152,66 +318,362 @@ def load_character(character_name, save_directory="data/save_games"):
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
-    # TODO: Implement load functionality
-    # Check if file exists → CharacterNotFoundError
-    # Try to read file → SaveFileCorruptedError
-    # Validate data format → InvalidSaveDataError
-    # Parse comma-separated lists back into Python lists
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character {character_name} not found.")
-    try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-            character = {}
-            for line in lines:
-                key = line.split(":")[0].strip()
-                value = line.split(":")[1].strip()
-                if key in ['INVENTORY', 'ACTIVE_QUESTS', 'COMPLETED_QUESTS']:
-                    character[key.lower()] = value.split(',') if value else []
-                elif key in ['LEVEL', 'HEALTH', 'MAX_HEALTH', 'STRENGTH', 'MAGIC', 'EXPERIENCE', 'GOLD']:
-                    character[key.lower()] = int(value)
-                else:
-                    character[key.lower()] = value
-        # Validate loaded character data
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    character = _cache_get(backend, character_name)
+    if character is None:
+        generation = _cache_generation(backend, character_name)
+        character = backend.load(character_name)
+        _cache_put(backend, character, generation)
+    backend.mark_clean(character)
+    return character
+
+def load_characters(character_names, save_directory="data/save_games", workers=8, backend=None):
+    """
+    Load many characters using a thread pool
+
+    Args:
+        character_names: Iterable of character names
+        save_directory: Directory containing save files
+        workers: Number of loader threads
+        backend: Storage backend to use instead of get_storage_backend()
+
+    Returns: Dictionary with 'characters' ({name: character}, in the
+             order given) and 'errors' ({name: error message}) for
+             saves that are missing or unreadable
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    character_names = list(character_names)
+
+    def load_one(character_name):
+        try:
+            return load_character(character_name, backend=backend), None
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError, OSError) as e:
+            return None, str(e)
+
+    characters = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for character_name, (character, error) in zip(character_names,
+                                                       executor.map(load_one, character_names)):
+            if error is None:
+                characters[character_name] = character
+            else:
+                errors[character_name] = error
+    return {'characters': characters, 'errors': errors}
+
+def deserialize_character(data, character_name="character"):
+    """
+    Parse save file contents back into a character dictionary
+
+    Args:
+        data: Save file contents (bytes), as built by serialize_character
+        character_name: Name used in error messages
+
+    Both save formats are accepted; binary saves are recognised by
+    their magic header.
+
+    Returns: Character dictionary
+    Raises:
+        SaveFileCorruptedError if the data can't be decoded
+        InvalidSaveDataError if data format is wrong
+    """
+    if data.startswith(BINARY_SAVE_MAGIC):
+        character = _deserialize_binary(data, character_name)
         validate_character_data(character)
         return character
-    except IOError:
+    try:
+        lines = data.decode('utf-8').splitlines()
+    except UnicodeDecodeError:
+        raise SaveFileCorruptedError(f"Save file for {character_name} is corrupted.")
+    character = {}
+    try:
+        for line in lines:
+            if not line.strip():
+                continue
+            key = line.split(":")[0].strip()
+            value = line.split(":", 1)[1].strip()
+            if key in ['INVENTORY', 'ACTIVE_QUESTS', 'COMPLETED_QUESTS']:
+                values = value.split(',') if value else []
+                character[key.lower()] = decode_inventory(values) if key == 'INVENTORY' else values
+            elif key == 'MODIFIERS':
+                character['modifiers'] = decode_modifiers(value.split(';') if value else [])
+            elif key in ['EQUIPPED_WEAPON', 'EQUIPPED_ARMOR']:
+                character[key.lower()] = value or None
+            elif key in ['LEVEL', 'HEALTH', 'MAX_HEALTH', 'STRENGTH', 'MAGIC', 'EXPERIENCE', 'GOLD']:
+                character[key.lower()] = int(value)
+            else:
+                character[key.lower()] = value
+    except (IndexError, ValueError):
+        raise InvalidSaveDataError(f"Save file for {character_name} has an invalid format.")
+    # Validate loaded character data
+    validate_character_data(character)
+    return character
+
+def encode_inventory(inventory):
+    """
+    Turn an inventory into save entries, one per distinct item
+
+    Returns: List of "item_id" (one unit) or "item_id*quantity" strings,
+             followed by "/stack" for items an Inventory recorded a stack
+             size above 1 for
+    """
+    entries = []
+    for item_id, count in item_counts(inventory).items():
+        entry = item_id if count == 1 else f"{item_id}*{count}"
+        if isinstance(inventory, Inventory) and inventory.stack_size(item_id) > 1:
+            entry += f"/{inventory.stack_size(item_id)}"
+        entries.append(entry)
+    return entries
+
+def decode_inventory(entries):
+    """
+    Build an Inventory from save entries
+
+    Accepts "item_id*quantity/stack" entries (quantity and stack are
+    optional) and the older one-entry-per-unit saves alike.
+
+    Raises: ValueError if a quantity or stack size is not a positive integer
+    """
+    inventory = Inventory()
+    for entry in entries:
+        entry, _, stack = entry.partition("/")
+        item_id, _, quantity = entry.partition("*")
+        inventory.add(item_id, int(quantity) if quantity else 1, int(stack) if stack else None)
+    return inventory
+
+def encode_modifiers(modifiers):
+    """
+    Turn a character's modifiers into save entries, one per source
+
+    Returns: List of "source=stat:value,stat:value" strings
+    """
+    return [source + "=" + ",".join(f"{stat_name}:{value}" for stat_name, value in stats)
+            for source, stats in modifiers.items()]
+
+def decode_modifiers(entries):
+    """
+    Build a modifiers dictionary {source: ((stat, value), ...)} from
+    save entries
+
+    Raises:
+        ValueError if an entry or value is malformed
+        InvalidSaveDataError if a stat is not in game_data.VALID_EFFECT_STATS
+    """
+    modifiers = {}
+    for entry in entries:
+        source, separator, stats = entry.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid modifier entry: {entry}")
+        pairs = []
+        for pair in stats.split(",") if stats else []:
+            stat_name, separator, value = pair.partition(":")
+            if not separator:
+                raise ValueError(f"Invalid modifier entry: {entry}")
+            if stat_name not in VALID_EFFECT_STATS:
+                raise InvalidSaveDataError(f"Unknown modifier stat: {stat_name}")
+            pairs.append((stat_name, int(value)))
+        modifiers[source] = tuple(pairs)
+    return modifiers
+
+def _serialize_binary(character):
+    """
+    Pack a character into the binary save format
+
+    Layout (little endian): magic and version, then name and class as
+    u16-length-prefixed UTF-8, the seven numeric stats as i64, and each
+    list as a u16 count and u32 byte length followed by its items
+    joined with NUL bytes. Version 2 adds the equipped weapon and armor
+    as length-prefixed strings (empty for none) and the modifiers as one
+    more list. Name, class and level come first so the summary can be
+    read from the start of the file.
+    """
+    parts = [_BINARY_HEADER.pack(BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION)]
+    for field in ('name', 'class'):
+        encoded = character[field].encode('utf-8')
+        parts.append(_BINARY_STRING.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(_BINARY_STATS.pack(*[character[field] for field in _BINARY_STAT_FIELDS]))
+    for field in _BINARY_LIST_FIELDS:
+        values = character.get(field, [])
+        if field == 'inventory':
+            values = encode_inventory(values)
+        parts.append(_pack_binary_list(values))
+    for field in _BINARY_EQUIPMENT_FIELDS:
+        encoded = (character.get(field) or "").encode('utf-8')
+        parts.append(_BINARY_STRING.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(_pack_binary_list(encode_modifiers(character.get('modifiers') or {})))
+    return b"".join(parts)
+
+def _pack_binary_list(values):
+    encoded = "\0".join(values).encode('utf-8')
+    return _BINARY_LIST.pack(len(values), len(encoded)) + encoded
+
+def _deserialize_binary(data, character_name):
+    """Unpack a binary save (without validating the character)"""
+    try:
+        magic, version = _BINARY_HEADER.unpack_from(data, 0)
+        if version not in (1, BINARY_SAVE_VERSION):
+            raise InvalidSaveDataError(
+                f"Save file for {character_name} has unsupported format version {version}.")
+        offset = _BINARY_HEADER.size
+        character = {}
+        for field in ('name', 'class'):
+            character[field], offset = _unpack_binary_string(data, offset)
+        character.update(zip(_BINARY_STAT_FIELDS, _BINARY_STATS.unpack_from(data, offset)))
+        offset += _BINARY_STATS.size
+        for field in _BINARY_LIST_FIELDS:
+            values, offset = _unpack_binary_list(data, offset, character_name)
+            character[field] = decode_inventory(values) if field == 'inventory' else values
+        if version >= 2:
+            for field in _BINARY_EQUIPMENT_FIELDS:
+                value, offset = _unpack_binary_string(data, offset)
+                if value:
+                    character[field] = value
+            values, offset = _unpack_binary_list(data, offset, character_name)
+            if values:
+                character['modifiers'] = decode_modifiers(values)
+    except (struct.error, UnicodeDecodeError, ValueError):
         raise SaveFileCorruptedError(f"Save file for {character_name} is corrupted.")
+    return character
+
+def _unpack_binary_string(data, offset):
+    """Read a u16-length-prefixed string; returns (string, next offset)"""
+    (length,) = _BINARY_STRING.unpack_from(data, offset)
+    offset += _BINARY_STRING.size
+    return _slice_exact(data, offset, length).decode('utf-8'), offset + length
+
+def _unpack_binary_list(data, offset, character_name):
+    """Read a counted NUL-joined list; returns (values, next offset)"""
+    count, length = _BINARY_LIST.unpack_from(data, offset)
+    offset += _BINARY_LIST.size
+    values = _slice_exact(data, offset, length).decode('utf-8').split("\0") if count else []
+    if len(values) != count:
+        raise InvalidSaveDataError(f"Save file for {character_name} has an invalid format.")
+    return values, offset + length
+
+def _slice_exact(data, offset, length):
+    """data[offset:offset + length], raising ValueError if it runs past the end"""
+    if offset + length > len(data):
+        raise ValueError("truncated save data")
+    return data[offset:offset + length]
+
+def migrate_to_sharded_layout(save_directory="data/save_games"):
+    """
+    Move flat <name>_save.txt files into the sharded layout
+
+    The directory is marked as sharded first, so saves made during the
+    migration already go to shards. Each file is moved with an atomic
+    rename and loads look in both places, so every character stays
+    readable throughout. Safe to re-run after an interruption.
+
+    Returns: Number of saves moved
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    marker = os.path.join(save_directory, FileCharacterStore.SHARDED_MARKER)
+    with open(marker, 'a'):
+        pass
+    store = _file_stores.get(save_directory)
+    if store is not None:
+        store.sharded = True
+    else:
+        store = FileCharacterStore(save_directory, sharded=True)
 
-def list_saved_characters(save_directory="data/save_games"):
+    moved = 0
+    with os.scandir(save_directory) as entries:
+        flat_saves = [entry.name for entry in entries if entry.name.endswith("_save.txt")]
+    for filename in flat_saves:
+        source = os.path.join(save_directory, filename)
+        target = store._sharded_path(filename[:-9])  # Remove '_save.txt'
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with store._lock:
+            try:
+                if os.path.exists(target):
+                    # Saved again since the scan; the sharded copy is newer
+                    os.remove(source)
+                else:
+                    os.replace(source, target)
+                    moved += 1
+            except FileNotFoundError:
+                pass
+    return moved
+
+def convert_saves(save_directory="data/save_games", save_format="binary"):
+    """
+    Rewrite every save file in save_directory in save_format
+
+    Saves are loaded in whatever format they are in and written back
+    atomically, so the conversion can be interrupted and re-run.
+
+    Returns: Dictionary with 'converted' (count) and 'errors'
+             ({name: error message}) for saves that could not be read
+    """
+    store = FileCharacterStore(save_directory, save_format=save_format)
+    converted = 0
+    errors = {}
+    for character_name in store.list():
+        try:
+            character = store.load(character_name)
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            errors[character_name] = str(e)
+            continue
+        store.save(character)
+        converted += 1
+    _cache_clear()
+    return {'converted': converted, 'errors': errors}
+
+def peek_character(character_name, save_directory="data/save_games", backend=None):
+    """
+    Read a character's name, class, level and gold without loading it
+
+    Both save formats keep these fields at the start of the save, so
+    only the first few hundred bytes are read and nothing else is
+    parsed or validated.
+
+    Returns: Dictionary with name, class, level and gold
+    Raises:
+        CharacterNotFoundError if the character isn't saved
+        InvalidSaveDataError if the summary fields can't be read
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    return backend.peek(character_name)
+
+def list_saved_characters(save_directory="data/save_games", backend=None):
     """
     Get list of all saved character names
     
     Returns: List of character names (without _save.txt extension)
     """
-    # TODO: Implement this function
-    # Return empty list if directory doesn't exist
-    # Extract character names from filenames
-    if not os.path.exists(save_directory):
-        return []
-    character_names = []
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            character_name = filename[:-9]  # Remove '_save.txt'
-            character_names.append(character_name)
-    return character_names  
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    return backend.list()
+
+def list_character_summaries(save_directory="data/save_games", backend=None):
+    """
+    Get a summary of every saved character without loading the saves
+
+    Returns: List of dictionaries with name, class, level and mtime
+    """
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    return backend.list_summaries()
 
-def delete_character(character_name, save_directory="data/save_games"):
+def delete_character(character_name, save_directory="data/save_games", backend=None):
     """
     Delete a character's save file
     
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
-    # TODO: Implement character deletion
-    # Verify file exists before attempting deletion
-    path = os.path.join(save_directory, f"{character_name}_save.txt")
-    #creates path to character save file
-    if not os.path.exists(path):
-    #checks if file exists
-        raise CharacterNotFoundError(f"Character {character_name} not found.")
-    os.remove(path)
+    if backend is None:
+        backend = get_storage_backend(save_directory)
+    _cache_discard(backend, character_name)
+    backend.delete(character_name)
+    _cache_discard(backend, character_name)
+    backend.forget(character_name)
     return True
 
 # ============================================================================
@@ -229,24 +691,77 @@ def gain_experience(character, xp_amount):
     - Increase strength by 2
     - Increase magic by 2
     - Restore health to max_health
-    
+
+    The XP spent on each level up is subtracted from experience. The
+    number of level ups is computed in closed form, so a huge grant
+    costs the same as a small one.
+
+    Returns: Number of levels gained
     Raises: CharacterDeadError if character health is 0
     """
-    # TODO: Implement experience gain and leveling
-    # Check if character is dead first
-    # Add experience
-    # Check for level up (can level up multiple times)
-    # Update stats on level up
-    character['experience'] += xp_amount
     if character['health'] <= 0:
         raise CharacterDeadError("Cannot gain experience: character is dead.")
-    while character['experience'] >= character['level'] * 100:
-        character['level'] += 1
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
-        character['health'] = character['max_health']
-        character['experience'] -= character['level'] * 100
+    character['experience'] += xp_amount
+    levels = levels_gained(character['level'], character['experience'])
+    if levels:
+        _apply_level_ups(character, levels)
+    return levels
+
+def gain_experience_batch(characters, amounts):
+    """
+    Give experience to many characters at once (e.g. a guild reward)
+
+    Nothing is changed if any character is dead.
+
+    Args:
+        characters: List of character dictionaries
+        amounts: XP for every character, or a list with one amount each
+
+    Returns: List with the number of levels each character gained
+    Raises:
+        CharacterDeadError if any character's health is 0
+        ValueError if amounts is a list of a different length
+    """
+    if isinstance(amounts, int):
+        amounts = [amounts] * len(characters)
+    elif len(amounts) != len(characters):
+        raise ValueError("amounts must have one entry per character")
+    for character in characters:
+        if character['health'] <= 0:
+            raise CharacterDeadError(f"Cannot gain experience: {character['name']} is dead.")
+    return [gain_experience(character, amount) for character, amount in zip(characters, amounts)]
+
+def levels_gained(level, experience):
+    """
+    How many level ups experience pays for, starting at level
+
+    Levelling from level L to L + k costs 100 * (k*L + k*(k-1)/2) XP,
+    so k is the largest root of a quadratic, found with math.isqrt.
+
+    Returns: Number of levels (0 if experience is below the next threshold)
+    """
+    budget = experience // 100
+    if budget < level:
+        return 0
+    # k^2 + (2L - 1)k - 2*budget <= 0
+    b = 2 * level - 1
+    k = (math.isqrt(b * b + 8 * budget) - b) // 2
+    # Guard against rounding at the boundary
+    while k * level + k * (k - 1) // 2 > budget:
+        k -= 1
+    while (k + 1) * level + (k + 1) * k // 2 <= budget:
+        k += 1
+    return k
+
+def _apply_level_ups(character, levels):
+    """Apply the stat increases and XP cost of levels level ups"""
+    level = character['level']
+    character['experience'] -= 100 * (levels * level + levels * (levels - 1) // 2)
+    character['level'] = level + levels
+    character['max_health'] += 10 * levels
+    character['strength'] += 2 * levels
+    character['magic'] += 2 * levels
+    character['health'] = character['max_health']
 
 def add_gold(character, amount):
     """
@@ -337,11 +852,1183 @@ def validate_character_data(character):
             if not isinstance(character[field], (int, float)):
                 raise InvalidSaveDataError(f"Invalid type for {field}: {type(character[field])}")
         if field in ['inventory', 'active_quests', 'completed_quests']:
-            if not isinstance(character[field], list):
+            list_types = (list, Inventory) if field == 'inventory' else list
+            if not isinstance(character[field], list_types):
                 raise InvalidSaveDataError(f"Invalid type for {field}: {type(character[field])}")
 
     return True
 
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+# (backend, name) -> character, least recently used first; None = disabled
+_character_cache = None
+_character_cache_size = 0
+_character_cache_lock = threading.Lock()
+# (backend, name) -> times the save was discarded by a save or delete.
+# A load only caches what it read if the count didn't change meanwhile.
+# Emptying this dictionary (to bound it, or on _cache_clear) bumps the
+# epoch instead, so loads in flight then don't cache at all.
+_cache_generations = {}
+_cache_epoch = 0
+_CACHE_GENERATIONS_LIMIT = 10000
+
+def enable_character_cache(max_size=256):
+    """
+    Keep up to max_size recently loaded characters in memory
+
+    Entries are dropped when the character is saved or deleted through
+    the module functions. Saves written by other processes are not
+    noticed while an entry is cached.
+    """
+    global _character_cache, _character_cache_size, _cache_epoch
+    with _character_cache_lock:
+        _character_cache = OrderedDict()
+        _character_cache_size = max_size
+        _cache_epoch += 1
+
+def disable_character_cache():
+    """Turn the character cache off and empty it"""
+    global _character_cache
+    with _character_cache_lock:
+        _character_cache = None
+
+def _cache_clear():
+    global _cache_epoch
+    with _character_cache_lock:
+        if _character_cache is not None:
+            _character_cache.clear()
+        _cache_generations.clear()
+        _cache_epoch += 1
+
+def _cache_generation(backend, character_name):
+    """Token to pass to _cache_put for a load that is about to start"""
+    with _character_cache_lock:
+        return _cache_epoch, _cache_generations.get((backend, character_name), 0)
+
+def _cache_get(backend, character_name):
+    """Copy of the cached character, or None"""
+    with _character_cache_lock:
+        if _character_cache is None:
+            return None
+        character = _character_cache.get((backend, character_name))
+        if character is None:
+            return None
+        _character_cache.move_to_end((backend, character_name))
+    return copy.deepcopy(character)
+
+def _cache_put(backend, character, generation):
+    """
+    Cache a character that was just loaded, unless it was saved or
+    deleted since _cache_generation returned generation
+    """
+    if _character_cache is None:
+        return
+    cached = copy.deepcopy(character)
+    with _character_cache_lock:
+        if _character_cache is None:
+            return
+        if generation != (_cache_epoch, _cache_generations.get((backend, cached['name']), 0)):
+            return
+        _character_cache[(backend, cached['name'])] = cached
+        _character_cache.move_to_end((backend, cached['name']))
+        while len(_character_cache) > _character_cache_size:
+            _character_cache.popitem(last=False)
+
+def _cache_discard(backend, character_name):
+    """Drop a cached character and stop loads in flight from caching it"""
+    global _cache_epoch
+    if _character_cache is None:
+        return
+    with _character_cache_lock:
+        if _character_cache is not None:
+            _character_cache.pop((backend, character_name), None)
+        key = (backend, character_name)
+        if key not in _cache_generations and len(_cache_generations) >= _CACHE_GENERATIONS_LIMIT:
+            _cache_generations.clear()
+            _cache_epoch += 1
+        _cache_generations[key] = _cache_generations.get(key, 0) + 1
+
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+# Backend used by the module-level save/load/list/delete functions when
+# set with set_storage_backend(); None means the filesystem backend
+_storage_backend = None
+
+# One FileCharacterStore per save directory
+_file_stores = {}
+
+def set_storage_backend(backend):
+    """
+    Route save_character, load_character, list_saved_characters and
+    delete_character through backend by default
+
+    Args:
+        backend: A CharacterStore, or None to go back to the filesystem
+                 backend (one FileCharacterStore per save_directory)
+    """
+    global _storage_backend
+    _storage_backend = backend
+
+def get_storage_backend(save_directory="data/save_games"):
+    """
+    Get the backend the module-level functions use
+
+    Returns: The backend passed to set_storage_backend, otherwise the
+             FileCharacterStore for save_directory
+    """
+    if _storage_backend is not None:
+        return _storage_backend
+    store = _file_stores.get(save_directory)
+    if store is None:
+        store = _file_stores.setdefault(save_directory, FileCharacterStore(save_directory))
+    return store
+
+class CharacterStore(abc.ABC):
+    """
+    Storage backend base class for characters
+
+    Backends must implement save, load, list and delete with the semantics of
+    the text save files:
+    - save(character, fsync=False) returns True
+    - load(name) returns a fresh character dictionary or raises
+      CharacterNotFoundError
+    - list() returns the saved character names
+    - delete(name) returns True or raises CharacterNotFoundError
+
+    New saves are written in save_format ('text' or 'binary'); loads
+    accept both.
+    """
+
+    def __init__(self, save_format="text"):
+        if save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unknown save format: {save_format}")
+        # Format new saves are written in; loads accept either format
+        self.save_format = save_format
+        # name -> _field_digests() as of the last save or load, least
+        # recently saved or loaded first
+        self._persisted = OrderedDict()
+
+    @abc.abstractmethod
+    def save(self, character, fsync=False):
+        """Save one character; returns True"""
+
+    def save_many(self, characters, fsync=True):
+        """Save many characters; returns the number saved"""
+        saved = 0
+        for character in characters:
+            self.save(character, fsync)
+            saved += 1
+        return saved
+
+    @abc.abstractmethod
+    def load(self, character_name):
+        """Load one character; raises CharacterNotFoundError if missing"""
+
+    @abc.abstractmethod
+    def list(self):
+        """Get the names of all saved characters"""
+
+    @abc.abstractmethod
+    def delete(self, character_name):
+        """Delete one save; raises CharacterNotFoundError if missing"""
+
+    def peek(self, character_name):
+        """Get the SUMMARY_FIELDS of a saved character"""
+        character = self.load(character_name)
+        return {field: character[field] for field in SUMMARY_FIELDS}
+
+    def list_summaries(self):
+        """
+        Get name, class, level and mtime (save time, or None if the
+        backend does not track it) for every saved character
+        """
+        summaries = []
+        for character_name in self.list():
+            character = self.load(character_name)
+            summaries.append({'name': character_name, 'class': character['class'],
+                              'level': character['level'], 'mtime': None})
+        return summaries
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+    # ------------------------------------------------------------------
+    # Dirty tracking (driven by the module-level functions)
+    # ------------------------------------------------------------------
+
+    def get_dirty_fields(self, character):
+        """
+        Get the saved fields that differ from what this backend last
+        saved or loaded for the character (all fields if unknown)
+        """
+        persisted = self._persisted.get(character['name'])
+        if persisted is None:
+            return list(SAVED_FIELDS)
+        digests = _field_digests(character)
+        size = _FIELD_DIGEST_SIZE
+        return [field for index, field in enumerate(SAVED_FIELDS)
+                if digests[index * size:(index + 1) * size]
+                != persisted[index * size:(index + 1) * size]]
+
+    def mark_clean(self, character):
+        """
+        Remember the character's fields as the persisted state (for at
+        most PERSISTED_LIMIT characters)
+        """
+        name = character['name']
+        self._persisted[name] = _field_digests(character)
+        self._persisted.move_to_end(name)
+        while len(self._persisted) > PERSISTED_LIMIT:
+            self._persisted.popitem(last=False)
+
+    def forget(self, character_name):
+        """Drop the persisted state of a deleted character"""
+        self._persisted.pop(character_name, None)
+
+class FileCharacterStore(CharacterStore):
+    """
+    One <name>_save.txt file per character in a directory (the default)
+
+    A manifest journal in the directory records the name, class, level
+    and save time of every character, so listing saves does not scan
+    the directory. Saves append an "S" line and deletes a "D" line; the
+    journal is rewritten once it holds mostly superseded lines. Each
+    change also appends a "V" line holding the directory's stamp
+    (mtime and size, and in the sharded layout those of every shard
+    directory too) after it. If the manifest is missing, or the
+    directory's stamp no longer matches the last one recorded (a save
+    added or removed by hand), it is rebuilt with os.scandir from the
+    first lines of each save.
+
+    With sharded=True saves live in ab/cd/<name>_save.txt, where abcd
+    starts the SHA-1 of the name, keeping every directory small. Flat
+    saves are still found, so a directory stays readable while
+    migrate_to_sharded_layout() moves them. sharded=None (the default)
+    uses the sharded layout if the directory has been migrated.
+    """
+
+    MANIFEST_NAME = ".manifest"
+    # Present in directories that use the sharded layout
+    SHARDED_MARKER = ".sharded"
+
+    def __init__(self, save_directory="data/save_games", save_format="text", sharded=None):
+        super().__init__(save_format)
+        self.save_directory = save_directory
+        self.manifest_path = os.path.join(save_directory, self.MANIFEST_NAME)
+        if sharded is None:
+            sharded = os.path.exists(os.path.join(save_directory, self.SHARDED_MARKER))
+        self.sharded = sharded
+        self._lock = threading.Lock()
+        self._summaries = None
+        self._manifest_stamp = None
+        # Directory stamp last recorded in the manifest
+        self._recorded_stamp = None
+        self._journal_lines = 0
+
+    def _flat_path(self, character_name):
+        return os.path.join(self.save_directory, f"{character_name}_save.txt")
+
+    def _sharded_path(self, character_name):
+        digest = hashlib.sha1(character_name.encode('utf-8')).hexdigest()
+        return os.path.join(self.save_directory, digest[:2], digest[2:4],
+                            f"{character_name}_save.txt")
+
+    def _path(self, character_name):
+        """Where a save of character_name is written"""
+        if self.sharded:
+            return self._sharded_path(character_name)
+        return self._flat_path(character_name)
+
+    def _find(self, character_name):
+        """Path of the existing save of character_name, or None"""
+        flat_path = self._flat_path(character_name)
+        if not self.sharded:
+            return flat_path if os.path.exists(flat_path) else None
+        sharded_path = self._sharded_path(character_name)
+        # Checked twice: a migration may move the file between the checks
+        for path in (sharded_path, flat_path, sharded_path):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_dirty_fields(self, character):
+        # A save removed behind our back must be rewritten
+        if character['name'] in self._persisted and self._find(character['name']) is None:
+            return list(SAVED_FIELDS)
+        return super().get_dirty_fields(character)
+
+    def save(self, character, fsync=False):
+        # Ensure directory exists
+        os.makedirs(self.save_directory, exist_ok=True)
+        with self._lock:
+            fresh = self._manifest_is_fresh()
+            path = self._write(character, fsync)
+            if fsync:
+                _fsync_directory(os.path.dirname(path))
+            self._record_save(character, fresh)
+        return True
+
+    def save_many(self, characters, fsync=True):
+        os.makedirs(self.save_directory, exist_ok=True)
+        saved = 0
+        directories = set()
+        with self._lock:
+            fresh = self._manifest_is_fresh()
+            try:
+                for character in characters:
+                    directories.add(os.path.dirname(self._write(character, fsync)))
+                    self._record_save(character, fresh)
+                    saved += 1
+            finally:
+                if fsync:
+                    for directory in directories:
+                        _fsync_directory(directory)
+        return saved
+
+    def _write(self, character, fsync):
+        """Atomically write one save; returns its path"""
+        path = self._path(character['name'])
+        if self.sharded:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, serialize_character(character, self.save_format), fsync)
+        if self.sharded:
+            # Drop a flat save the migration has not reached yet
+            try:
+                os.remove(self._flat_path(character['name']))
+            except FileNotFoundError:
+                pass
+        return path
+
+    def load(self, character_name):
+        file_path = self._find(character_name)
+        if file_path is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        except IOError:
+            raise SaveFileCorruptedError(f"Save file for {character_name} is corrupted.")
+        return deserialize_character(data, character_name)
+
+    def peek(self, character_name):
+        file_path = self._find(character_name)
+        if file_path is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        try:
+            with open(file_path, 'rb') as f:
+                return _read_summary(f, character_name)
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        except IOError:
+            raise SaveFileCorruptedError(f"Save file for {character_name} is corrupted.")
+
+    def list(self):
+        return [summary['name'] for summary in self.list_summaries()]
+
+    def list_summaries(self):
+        # Return empty list if directory doesn't exist
+        if not os.path.exists(self.save_directory):
+            return []
+        with self._lock:
+            if not self._manifest_is_fresh():
+                self._rebuild_manifest()
+            return [dict(summary) for summary in self._summaries.values()]
+
+    def delete(self, character_name):
+        path = self._find(character_name)
+        if path is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        with self._lock:
+            fresh = self._manifest_is_fresh()
+            os.remove(path)
+            if fresh:
+                self._summaries.pop(character_name, None)
+                self._append_manifest(f"D\t{character_name}\n")
+            else:
+                self._summaries = None
+        return True
+
+    def _iter_save_entries(self):
+        """Yield a DirEntry for every save file, flat or sharded"""
+        with os.scandir(self.save_directory) as entries:
+            for entry in entries:
+                if entry.name.endswith("_save.txt"):
+                    yield entry
+                elif len(entry.name) == 2 and entry.is_dir():
+                    with os.scandir(entry.path) as shards:
+                        for shard in shards:
+                            if not shard.is_dir():
+                                continue
+                            with os.scandir(shard.path) as saves:
+                                for save in saves:
+                                    if save.name.endswith("_save.txt"):
+                                        yield save
+
+    # ------------------------------------------------------------------
+    # Manifest journal
+    # ------------------------------------------------------------------
+
+    def _directory_stamp(self):
+        """
+        Stamp of the save directory, as recorded in the manifest
+
+        In the sharded layout saves are added to and removed from the
+        ab/cd shard directories, which leaves the top directory alone,
+        so the stamp also covers every shard directory.
+
+        Returns: Tuple of (stamp string, newest st_mtime_ns)
+        """
+        stat = os.stat(self.save_directory)
+        if not self.sharded:
+            return f"{stat.st_mtime_ns}:{stat.st_size}", stat.st_mtime_ns
+        stamps = [f"{stat.st_mtime_ns}:{stat.st_size}"]
+        newest = stat.st_mtime_ns
+        with os.scandir(self.save_directory) as entries:
+            shard_dirs = sorted(entry.path for entry in entries
+                                if len(entry.name) == 2 and entry.is_dir())
+        for shard_dir in shard_dirs:
+            with os.scandir(shard_dir) as entries:
+                paths = [shard_dir] + sorted(entry.path for entry in entries if entry.is_dir())
+            for path in paths:
+                stat = os.stat(path)
+                stamps.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+                newest = max(newest, stat.st_mtime_ns)
+        digest = hashlib.blake2b("\n".join(stamps).encode('utf-8'), digest_size=16)
+        return digest.hexdigest(), newest
+
+    def _manifest_is_fresh(self):
+        """
+        True if the manifest is loaded into _summaries and the directory
+        stamp it recorded last still matches the directory
+        """
+        try:
+            if self._summaries is None or self._manifest_stamp != _file_stamp(self.manifest_path):
+                # Not read yet, or written by another process since
+                if not self._read_manifest():
+                    return False
+            return self._recorded_stamp == self._directory_stamp()[0]
+        except OSError:
+            return False
+
+    def _record_save(self, character, fresh):
+        """Journal a save that was just written (only if the manifest was fresh)"""
+        if not fresh:
+            self._summaries = None
+            return
+        summary = {'name': character['name'], 'class': character['class'],
+                   'level': character['level'], 'mtime': time.time()}
+        self._summaries[summary['name']] = summary
+        self._append_manifest(self._manifest_line(summary))
+
+    def _append_manifest(self, line):
+        """
+        Journal a change that was just made, followed by the directory
+        stamp it left behind (only while the manifest is fresh)
+        """
+        self._recorded_stamp = self._directory_stamp()[0]
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(f"{line}V\t{self._recorded_stamp}\n")
+        self._journal_lines += 2
+        self._manifest_stamp = _file_stamp(self.manifest_path)
+        if self._journal_lines > 2 * len(self._summaries) + 100:
+            self._write_manifest()
+
+    def _read_manifest(self):
+        """
+        Load the journal into _summaries
+
+        Returns: False if any line is malformed (e.g. torn by a crash);
+                 the caller then rebuilds the manifest from the saves
+        """
+        summaries = {}
+        recorded_stamp = None
+        lines = 0
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    lines += 1
+                    if fields[0] == "S" and len(fields) == 5:
+                        summaries[fields[1]] = {
+                            'name': fields[1], 'class': fields[2] or None,
+                            'level': int(fields[3]) if fields[3] else None,
+                            'mtime': float(fields[4])}
+                    elif fields[0] == "D" and len(fields) == 2:
+                        summaries.pop(fields[1], None)
+                    elif fields[0] == "V" and len(fields) == 2:
+                        recorded_stamp = fields[1]
+                    else:
+                        return False
+        except (OSError, ValueError):
+            return False
+        self._summaries = summaries
+        self._recorded_stamp = recorded_stamp
+        self._journal_lines = lines
+        self._manifest_stamp = _file_stamp(self.manifest_path)
+        return True
+
+    @staticmethod
+    def _manifest_line(summary):
+        """Format a save journal line (class and level are empty for unreadable saves)"""
+        level = "" if summary['level'] is None else summary['level']
+        return f"S\t{summary['name']}\t{summary['class'] or ''}\t{level}\t{summary['mtime']}\n"
+
+    def _rebuild_manifest(self):
+        """Rebuild the manifest from the save files themselves"""
+        # Create the manifest before stamping the directory, so writing it
+        # doesn't change the directory afterwards
+        with open(self.manifest_path, 'a', encoding='utf-8'):
+            pass
+        # Stamp before scanning: a save added during the scan changes the
+        # directory after the stamp, so the next listing scans again. If
+        # the directory changed within the last tick, a change made right
+        # after the stamp could leave the mtime as it is, so wait the tick
+        # out and stamp again.
+        stamp, mtime_ns = self._directory_stamp()
+        age = time.time_ns() - mtime_ns
+        while 0 <= age < RACY_STAMP_NS:
+            time.sleep((RACY_STAMP_NS - age) / 1e9)
+            stamp, mtime_ns = self._directory_stamp()
+            age = time.time_ns() - mtime_ns
+        summaries = {}
+        for entry in self._iter_save_entries():
+            summary = _read_save_summary(entry.path)
+            summary['name'] = entry.name[:-9]  # Remove '_save.txt'
+            summary['mtime'] = entry.stat().st_mtime
+            summaries[summary['name']] = summary
+        self._summaries = summaries
+        self._recorded_stamp = stamp
+        self._write_manifest()
+
+    def _write_manifest(self):
+        """Rewrite the journal with one line per saved character"""
+        lines = [self._manifest_line(summary) for summary in self._summaries.values()]
+        lines.append(f"V\t{self._recorded_stamp}\n")
+        # Rewritten in place, since replacing the file would change the
+        # directory stamp. A torn rewrite is either malformed or lacks the
+        # final V line, so it is rebuilt rather than trusted.
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))
+        self._journal_lines = len(lines)
+        self._manifest_stamp = _file_stamp(self.manifest_path)
+
+class MemoryCharacterStore(CharacterStore):
+    """
+    Characters kept in a dictionary, for tests and load tests
+
+    Saves are stored serialized, so a loaded character never shares
+    lists with the one that was saved, just like with files.
+    """
+
+    def __init__(self, save_format="text"):
+        super().__init__(save_format)
+        self._saves = {}
+
+    def save(self, character, fsync=False):
+        self._saves[character['name']] = serialize_character(character, self.save_format)
+        return True
+
+    def load(self, character_name):
+        data = self._saves.get(character_name)
+        if data is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return deserialize_character(data, character_name)
+
+    def peek(self, character_name):
+        data = self._saves.get(character_name)
+        if data is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return _read_summary(io.BytesIO(data), character_name)
+
+    def list(self):
+        return list(self._saves)
+
+    def delete(self, character_name):
+        if self._saves.pop(character_name, None) is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return True
+
+class SingleFileCharacterStore(CharacterStore):
+    """
+    All characters in one append-only file
+
+    Every save appends a record (kind, name, save data) and every delete
+    appends a tombstone. An in-memory index maps names to the offset of
+    their latest save, so loads are one seek and one read. The file is
+    compacted automatically once dead records outweigh live ones.
+    A torn record left by a crash is dropped when the file is opened.
+    """
+
+    # kind (1 = save, 0 = delete), name length, data length
+    RECORD_HEADER = struct.Struct('<BHI')
+    COMPACT_MIN_BYTES = 1 << 20
+
+    def __init__(self, path="data/save_games/characters.store", save_format="text"):
+        super().__init__(save_format)
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        """Open the file and rebuild the index from its records"""
+        self._file = open(self.path, 'a+b')
+        self._index = {}
+        self._live_bytes = 0
+        self._dead_bytes = 0
+        header_size = self.RECORD_HEADER.size
+        self._file.seek(0)
+        data = self._file.read()
+        offset = 0
+        while offset + header_size <= len(data):
+            kind, name_length, data_length = self.RECORD_HEADER.unpack_from(data, offset)
+            end = offset + header_size + name_length + data_length
+            if end > len(data):
+                break
+            name = data[offset + header_size:offset + header_size + name_length].decode('utf-8')
+            self._drop(name)
+            if kind == 1:
+                self._index[name] = (offset + header_size + name_length, data_length)
+                self._live_bytes += end - offset
+            else:
+                self._dead_bytes += end - offset
+            offset = end
+        if offset < len(data):
+            # Torn write at the end of the file
+            self._file.truncate(offset)
+
+    def _drop(self, name):
+        """Forget a name's current record, counting it as dead space"""
+        entry = self._index.pop(name, None)
+        if entry is not None:
+            size = self.RECORD_HEADER.size + len(name.encode('utf-8')) + entry[1]
+            self._live_bytes -= size
+            self._dead_bytes += size
+
+    def _append(self, kind, name, data, fsync):
+        encoded_name = name.encode('utf-8')
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(self.RECORD_HEADER.pack(kind, len(encoded_name), len(data))
+                         + encoded_name + data)
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        return offset + self.RECORD_HEADER.size + len(encoded_name)
+
+    def save(self, character, fsync=False):
+        name = character['name']
+        data = serialize_character(character, self.save_format)
+        with self._lock:
+            self._put(name, data, fsync)
+            self._maybe_compact()
+        return True
+
+    def save_many(self, characters, fsync=True):
+        saves = [(character['name'], serialize_character(character, self.save_format))
+                 for character in characters]
+        with self._lock:
+            for name, data in saves:
+                self._put(name, data, False)
+            # One fsync makes the whole batch durable
+            if fsync and saves:
+                os.fsync(self._file.fileno())
+            self._maybe_compact()
+        return len(saves)
+
+    def _put(self, name, data, fsync):
+        """Append a save record and point the index at it (lock held)"""
+        data_offset = self._append(1, name, data, fsync)
+        self._drop(name)
+        self._index[name] = (data_offset, len(data))
+        self._live_bytes += self.RECORD_HEADER.size + len(name.encode('utf-8')) + len(data)
+
+    def load(self, character_name):
+        return deserialize_character(self._read(character_name), character_name)
+
+    def peek(self, character_name):
+        # Saves are small; one read of the record is cheaper than several
+        return _read_summary(io.BytesIO(self._read(character_name)), character_name)
+
+    def _read(self, character_name):
+        with self._lock:
+            entry = self._index.get(character_name)
+            if entry is None:
+                raise CharacterNotFoundError(f"Character {character_name} not found.")
+            self._file.seek(entry[0])
+            data = self._file.read(entry[1])
+        if len(data) != entry[1]:
+            raise SaveFileCorruptedError(f"Save file for {character_name} is corrupted.")
+        return data
+
+    def list(self):
+        return list(self._index)
+
+    def delete(self, character_name):
+        with self._lock:
+            if character_name not in self._index:
+                raise CharacterNotFoundError(f"Character {character_name} not found.")
+            self._append(0, character_name, b"", False)
+            self._drop(character_name)
+            self._dead_bytes += self.RECORD_HEADER.size + len(character_name.encode('utf-8'))
+            self._maybe_compact()
+        return True
+
+    def _maybe_compact(self):
+        if self._dead_bytes > max(self._live_bytes, self.COMPACT_MIN_BYTES):
+            self._compact()
+
+    def compact(self):
+        """Rewrite the file with only each character's latest save"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        records = []
+        for name, (data_offset, data_length) in self._index.items():
+            self._file.seek(data_offset)
+            encoded_name = name.encode('utf-8')
+            records.append(self.RECORD_HEADER.pack(1, len(encoded_name), data_length)
+                           + encoded_name + self._file.read(data_length))
+        self._file.close()
+        _atomic_write(self.path, b"".join(records), fsync=True)
+        self._open()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class SqliteCharacterStore(CharacterStore):
+    """
+    Character store backed by a single SQLite database
+
+    Same save/load/list/delete semantics as the text save files, but
+    characters live in one indexed table instead of one file each. The
+    database runs in WAL mode and every thread gets its own pooled
+    connection. Use transaction() (or save_many) to batch writes.
+    """
+
+    def __init__(self, database_path="data/save_games/characters.db", save_format="text"):
+        super().__init__(save_format)
+        self.database_path = database_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS characters ("
+            " name TEXT PRIMARY KEY,"
+            " class TEXT NOT NULL,"
+            " level INTEGER NOT NULL,"
+            " gold INTEGER NOT NULL,"
+            " data BLOB NOT NULL,"
+            " updated REAL NOT NULL)")
+        connection.commit()
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_path, timeout=30,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.in_transaction = False
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _commit(self, connection):
+        if not self._local.in_transaction:
+            connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several saves/deletes into one transaction
+
+        Commits when the block finishes, rolls everything back if it raises.
+        """
+        connection = self._connection()
+        if self._local.in_transaction:
+            yield self
+            return
+        self._local.in_transaction = True
+        try:
+            yield self
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            self._local.in_transaction = False
+
+    def save(self, character, fsync=False):
+        """
+        Save (insert or replace) a character
+
+        Returns: True if successful
+        """
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO characters (name, class, level, gold, data, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (character['name'], character['class'], character['level'],
+             character['gold'], serialize_character(character, self.save_format), time.time()))
+        self._commit(connection)
+        return True
+
+    def save_many(self, characters, fsync=True):
+        """
+        Save many characters in a single transaction
+
+        Returns: Number of characters saved
+        """
+        saved = 0
+        with self.transaction():
+            for character in characters:
+                self.save(character)
+                saved += 1
+        return saved
+
+    def load(self, character_name):
+        """
+        Load a character
+
+        Raises:
+            CharacterNotFoundError if the character isn't stored
+            SaveFileCorruptedError / InvalidSaveDataError for bad data
+        """
+        row = self._connection().execute(
+            "SELECT data FROM characters WHERE name = ?", (character_name,)).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return deserialize_character(row[0], character_name)
+
+    def peek(self, character_name):
+        """Get name, class, level and gold from the indexed columns"""
+        row = self._connection().execute(
+            "SELECT name, class, level, gold FROM characters WHERE name = ?",
+            (character_name,)).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return dict(zip(SUMMARY_FIELDS, row))
+
+    def list(self):
+        """Get the names of all stored characters, sorted"""
+        rows = self._connection().execute("SELECT name FROM characters ORDER BY name")
+        return [row[0] for row in rows]
+
+    def list_summaries(self):
+        """Get name, class, level and mtime from the indexed columns"""
+        rows = self._connection().execute(
+            "SELECT name, class, level, updated FROM characters ORDER BY name")
+        return [{'name': name, 'class': character_class, 'level': level, 'mtime': updated}
+                for name, character_class, level, updated in rows]
+
+    def delete(self, character_name):
+        """
+        Delete a character
+
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if the character isn't stored
+        """
+        connection = self._connection()
+        cursor = connection.execute("DELETE FROM characters WHERE name = ?", (character_name,))
+        self._commit(connection)
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return True
+
+    def migrate_text_saves(self, save_directory="data/save_games"):
+        """
+        One-shot import of every <name>_save.txt file in save_directory
+
+        All readable saves are imported in a single transaction. Saves
+        that fail to load are skipped and reported.
+
+        Returns: Dictionary with 'migrated' (count) and 'errors'
+                 ({name: error message})
+        """
+        characters = []
+        errors = {}
+        text_saves = FileCharacterStore(save_directory)
+        for character_name in text_saves.list():
+            try:
+                characters.append(text_saves.load(character_name))
+            except (SaveFileCorruptedError, InvalidSaveDataError) as e:
+                errors[character_name] = str(e)
+        return {'migrated': self.save_many(characters), 'errors': errors}
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+# ============================================================================
+# BACKGROUND SAVES
+# ============================================================================
+
+class SaveQueue:
+    """
+    Saves characters on a background thread
+
+    submit() copies the character and returns at once. Repeated submits
+    of the same character before it is written are coalesced into one
+    write of the latest state. The writer thread starts on the first
+    submit; flush() waits until everything submitted so far is written,
+    and close() (also run at interpreter exit) flushes and stops it.
+    """
+
+    def __init__(self, save_directory="data/save_games", backend=None, fsync=False):
+        self.save_directory = save_directory
+        self.backend = backend
+        self.fsync = fsync
+        self.errors = {}
+        self._pending = {}
+        self._in_flight = 0
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._coalesced = 0
+        self._written = 0
+        self._failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = None
+
+    def submit(self, character):
+        """
+        Queue a save of the character's current state
+
+        Raises: RuntimeError if the queue has been closed
+        """
+        snapshot = copy.deepcopy(character)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveQueue is closed")
+            if snapshot['name'] in self._pending:
+                self._coalesced += 1
+            self._pending[snapshot['name']] = snapshot
+            self._submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SaveQueue", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until every submitted save has been written (or failed)
+
+        Returns: True if the queue drained, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self):
+        """Flush outstanding saves and stop the writer thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self.close)
+
+    def metrics(self):
+        """
+        Get queue and write statistics
+
+        Returns: Dictionary with queue_depth, in_flight, submitted,
+                 coalesced, written, failed and write latencies in
+                 seconds (last, average and max)
+        """
+        with self._condition:
+            return {
+                'queue_depth': len(self._pending),
+                'in_flight': self._in_flight,
+                'submitted': self._submitted,
+                'coalesced': self._coalesced,
+                'written': self._written,
+                'failed': self._failed,
+                'write_latency_last': self._latency_last,
+                'write_latency_avg': self._latency_total / self._written if self._written else None,
+                'write_latency_max': self._latency_max,
+            }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                batch = self._pending
+                self._pending = {}
+                self._in_flight = len(batch)
+            for name, character in batch.items():
+                start = time.perf_counter()
+                try:
+                    save_character(character, self.save_directory, fsync=self.fsync,
+                                   backend=self.backend)
+                except Exception as e:
+                    with self._condition:
+                        self.errors[name] = e
+                        self._failed += 1
+                else:
+                    latency = time.perf_counter() - start
+                    with self._condition:
+                        self.errors.pop(name, None)
+                        self._written += 1
+                        self._latency_total += latency
+                        self._latency_max = max(self._latency_max, latency)
+                        self._latency_last = latency
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+# ============================================================================
+# FILE HELPERS
+# ============================================================================
+
+def _atomic_write(file_path, data, fsync=False):
+    """
+    Replace file_path with data without ever exposing a partial file
+
+    Writes to a hidden temporary file in the same directory with a single
+    write call, optionally fsyncs it, then os.replace()s it into place.
+    """
+    directory = os.path.dirname(file_path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _file_stamp(path):
+    """(mtime_ns, size) of a file, used to notice changes by other processes"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_save_summary(path):
+    """
+    Read class and level from the header of a save
+
+    Returns: Dictionary with 'class' and 'level' (None if unreadable)
+    """
+    try:
+        with open(path, 'rb') as f:
+            summary = _read_summary(f, path, fields=('class', 'level'))
+    except (OSError, InvalidSaveDataError):
+        return {'class': None, 'level': None}
+    return {'class': summary['class'], 'level': summary['level']}
+
+def _read_summary(f, character_name, fields=SUMMARY_FIELDS):
+    """
+    Read summary fields from the start of an open save file
+
+    Reads 512 bytes, then twice as much each time the fields are not
+    all there yet (only very long names need more than one read).
+
+    Returns: Dictionary with (at least) the requested fields
+    Raises: InvalidSaveDataError if the save ends before the fields do
+    """
+    head = b""
+    size = 512
+    while True:
+        chunk = f.read(size)
+        head += chunk
+        complete = len(chunk) < size
+        summary = _parse_save_header(head, complete)
+        if all(field in summary for field in fields):
+            return summary
+        if complete:
+            raise InvalidSaveDataError(f"Save file for {character_name} has an invalid format.")
+        size *= 2
+
+def _parse_save_header(head, complete):
+    """
+    Get the summary fields found at the start of a save
+
+    Args:
+        head: First bytes of the save
+        complete: True if head is the whole save
+
+    Returns: Dictionary with the summary fields that could be read
+    """
+    if head.startswith(BINARY_SAVE_MAGIC):
+        try:
+            offset = _BINARY_HEADER.size
+            strings = []
+            for _ in range(2):
+                (length,) = _BINARY_STRING.unpack_from(head, offset)
+                offset += _BINARY_STRING.size
+                strings.append(_slice_exact(head, offset, length).decode('utf-8'))
+                offset += length
+            stats = dict(zip(_BINARY_STAT_FIELDS, _BINARY_STATS.unpack_from(head, offset)))
+        except (struct.error, UnicodeDecodeError, ValueError):
+            return {}
+        return {'name': strings[0], 'class': strings[1],
+                'level': stats['level'], 'gold': stats['gold']}
+
+    if not complete:
+        # Only look at whole lines
+        head = head[:head.rfind(b"\n") + 1]
+    summary = {}
+    for line in head.decode('utf-8', errors='replace').split("\n"):
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        if key in ('name', 'class'):
+            summary[key] = value.strip()
+        elif key in ('level', 'gold'):
+            try:
+                summary[key] = int(value.strip())
+            except ValueError:
+                pass
+    return summary
+
+def _fsync_directory(directory):
+    """Flush directory entry changes (new/renamed files) to disk"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories can't be opened on some platforms (e.g. Windows)
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -194,6 +194,10 @@ class SimpleBattle:
         
         Damage formula: attacker['strength'] - (defender['strength'] // 4)
         Minimum damage: 1
+
+        Character stats are effective values (equipment and buffs
+        included), kept current by inventory_system.add_modifier and
+        remove_modifier, so no bonuses are recomputed per attack.
         
         Returns: Integer damage amount
         """
@@ -10,17 +10,344 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import gc
+import glob
+import hashlib
+import marshal
+import mmap
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed for to_columns()
+    np = None
 from custom_exceptions import (
+    DataError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Stats an item EFFECT may modify
+VALID_EFFECT_STATS = ('health', 'max_health', 'strength', 'magic')
+
+# Compiled effects by EFFECT string, shared between items
+_compiled_effects = {}
+
+# Compiled catalog snapshots are written next to the source file
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 5
+
+# ============================================================================
+# CATALOG RECORDS
+# ============================================================================
+
+class CatalogRecord(Mapping):
+    """
+    Compact, read-only catalog record with dict-style access
+
+    Records store their fields in __slots__ instead of a per-record dict,
+    but still support record['field'], record.get(), 'field' in record,
+    .keys()/.items() and comparison with plain dictionaries.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    # Values for optional fields missing from the data file
+    DEFAULTS = {}
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __reduce__(self):
+        return (self.__class__, self.to_tuple())
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def to_tuple(self):
+        """Return the field values in FIELDS order"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a validated data dictionary"""
+        return cls(*[data[field] if field in data else cls.DEFAULTS[field]
+                     for field in cls.FIELDS])
+
+    @classmethod
+    def pack_extras(cls, records):
+        """
+        Derived data to store with a compiled snapshot so from_columns
+        doesn't have to recompute it (none by default)
+        """
+        return None
+
+class QuestRecord(CatalogRecord):
+    """One quest from quests.txt"""
+
+    FIELDS = ('quest_id', 'title', 'description', 'reward_xp',
+              'reward_gold', 'required_level', 'prerequisite')
+    __slots__ = FIELDS
+
+    def __init__(self, quest_id, title, description, reward_xp,
+                 reward_gold, required_level, prerequisite):
+        self.quest_id = quest_id
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        # Prerequisites repeat across many quests, so share one string
+        self.prerequisite = sys.intern(prerequisite)
+
+    @classmethod
+    def from_columns(cls, columns, extras=None):
+        """
+        Build quests in bulk from one value list per field (FIELDS order)
+
+        Used for compiled snapshots, whose values are already validated
+        and whose repeated strings are already shared (see _pack_columns),
+        so slots are filled directly instead of running __init__ per quest.
+
+        Returns: List of QuestRecord
+        """
+        new = cls.__new__
+        records = []
+        append = records.append
+        for quest_id, title, description, reward_xp, reward_gold, \
+                required_level, prerequisite in zip(*columns):
+            record = new(cls)
+            record.quest_id = quest_id
+            record.title = title
+            record.description = description
+            record.reward_xp = reward_xp
+            record.reward_gold = reward_gold
+            record.required_level = required_level
+            record.prerequisite = prerequisite
+            append(record)
+        return records
+
+class ItemRecord(CatalogRecord):
+    """One item from items.txt, with its EFFECT precompiled"""
+
+    FIELDS = ('item_id', 'name', 'type', 'effect', 'cost', 'description', 'stack')
+    DEFAULTS = {'stack': 1}
+    __slots__ = FIELDS + ('compiled_effect',)
+
+    def __init__(self, item_id, name, type, effect, cost, description, stack=1):
+        self.item_id = item_id
+        self.name = name
+        # Types and effects repeat across many items, so share one string
+        self.type = sys.intern(type)
+        self.effect = sys.intern(effect)
+        self.cost = cost
+        self.description = description
+        # How many units share one inventory slot
+        self.stack = stack
+        self.compiled_effect = compile_item_effect(effect)
+
+    @classmethod
+    def pack_extras(cls, records):
+        """Store each distinct EFFECT's compiled modifiers in the snapshot"""
+        return {record.effect: record.compiled_effect.modifiers for record in records}
+
+    @classmethod
+    def from_columns(cls, columns, extras=None):
+        """
+        Build items in bulk from one value list per field (FIELDS order)
+
+        Like QuestRecord.from_columns, but also compiles each distinct
+        EFFECT once rather than once per item. extras, if given, is the
+        pack_extras() mapping saved with the snapshot, so effects are
+        rebuilt from their stored modifiers without parsing them again.
+
+        Returns: List of ItemRecord
+        """
+        if extras is None:
+            compiled = {effect: compile_item_effect(effect) for effect in set(columns[3])}
+        else:
+            compiled = {effect: _restore_item_effect(effect, modifiers)
+                        for effect, modifiers in extras.items()}
+        new = cls.__new__
+        records = []
+        append = records.append
+        for item_id, name, type, effect, cost, description, stack in zip(*columns):
+            record = new(cls)
+            record.item_id = item_id
+            record.name = name
+            record.type = type
+            record.effect = effect
+            record.cost = cost
+            record.description = description
+            record.stack = stack
+            record.compiled_effect = compiled[effect]
+            append(record)
+        return records
+
+class ItemEffect:
+    """
+    Compiled item effect
+
+    modifiers is a tuple of (stat_name, value) pairs, so applying an
+    effect needs no string work. Effects are shared between items with
+    the same EFFECT text.
+    """
+
+    __slots__ = ('modifiers',)
+
+    def __init__(self, modifiers):
+        self.modifiers = tuple(modifiers)
+
+    def __eq__(self, other):
+        return isinstance(other, ItemEffect) and self.modifiers == other.modifiers
+
+    def __hash__(self):
+        return hash(self.modifiers)
+
+    def __reduce__(self):
+        return (ItemEffect, (self.modifiers,))
+
+    def __repr__(self):
+        return f"ItemEffect({self.modifiers!r})"
+
+# ============================================================================
+# INDEXED CATALOGS
+# ============================================================================
+
+class IndexedCatalog(dict):
+    """
+    Catalog dictionary {id: record} with secondary indexes
+
+    Indexes are built on first query and thrown away whenever an entry
+    is added, replaced or removed. Records themselves are read-only
+    Mappings, so they can't change underneath an index. Subclasses
+    override _build_indexes to add their own.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._indexes = None
+
+    def _get_indexes(self):
+        if self._indexes is None:
+            self._indexes = self._build_indexes()
+        return self._indexes
+
+    def _build_indexes(self):
+        """Build the indexes from the current records (none by default)"""
+        return {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._indexes = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._indexes = None
+
+    def clear(self):
+        super().clear()
+        self._indexes = None
+
+    def pop(self, *args):
+        self._indexes = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._indexes = None
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._indexes = None
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._indexes = None
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._indexes = None
+        return self
+
+    def copy(self):
+        return self.__class__(self)
+
+class QuestCatalog(IndexedCatalog):
+    """Quest catalog indexed by required_level"""
+
+    def _build_indexes(self):
+        quests = sorted(self.values(), key=lambda quest: quest['required_level'])
+        levels = [quest['required_level'] for quest in quests]
+        return levels, quests
+
+    def quests_between_levels(self, min_level=None, max_level=None):
+        """
+        Get quests whose required_level is within [min_level, max_level]
+
+        Either bound may be None for no limit. Runs in O(log n + k).
+
+        Returns: List of quests sorted by required_level (file order
+                 within a level)
+        """
+        levels, quests = self._get_indexes()
+        start = 0 if min_level is None else bisect_left(levels, min_level)
+        end = len(levels) if max_level is None else bisect_right(levels, max_level)
+        return quests[start:end]
+
+class ItemCatalog(IndexedCatalog):
+    """Item catalog indexed by cost, overall and per item type"""
+
+    def _build_indexes(self):
+        by_cost = sorted(self.values(), key=lambda item: item['cost'])
+        index = {None: ([item['cost'] for item in by_cost], by_cost)}
+        for item in by_cost:
+            costs, items = index.setdefault(item['type'], ([], []))
+            costs.append(item['cost'])
+            items.append(item)
+        return index
+
+    def items_in_price_range(self, min_cost=None, max_cost=None, item_type=None):
+        """
+        Get items costing within [min_cost, max_cost]
+
+        Args:
+            min_cost, max_cost: Bounds, or None for no limit
+            item_type: Only include this type (weapon, armor, consumable)
+
+        Returns: List of items sorted by cost. Runs in O(log n + k).
+        """
+        costs, items = self._get_indexes().get(item_type, ([], []))
+        start = 0 if min_cost is None else bisect_left(costs, min_cost)
+        end = len(costs) if max_cost is None else bisect_right(costs, max_cost)
+        return items[start:end]
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
@@ -32,35 +359,23 @@ def load_quests(filename="data/quests.txt"):
     REWARD_GOLD: 50
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
+
+    Args:
+        filename: Path to the quest data file
+        use_cache: If True, load from (and maintain) a compiled snapshot
+                   of the catalog stored next to the file
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Returns: QuestCatalog (a dictionary) of quests {quest_id: QuestRecord}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle:
-    # - FileNotFoundError → raise MissingDataFileError
-    # - Invalid format → raise InvalidDataFormatError
-    # - Corrupted/unreadable data → raise CorruptedDataError
-    os.path.exists(filename)
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest data file '{filename}' not found.")
-    quests = {}
-    try:
-        with open(filename, 'r') as file:
-            content = file.read()
-            quest_blocks = content.strip().split('\n\n')
-            for block in quest_blocks:
-                lines = block.strip().split('\n')
-                quest_dict = parse_quest_block(lines)
-                validate_quest_data(quest_dict)
-                quests[quest_dict['quest_id']] = quest_dict
-    except IOError:
-        raise CorruptedDataError(f"Quest data file '{filename}' is corrupted or unreadable.")
-    except InvalidDataFormatError as e:
-        raise e
+    if use_cache:
+        return _load_with_cache(filename, "Quest", load_quests, QuestRecord, QuestCatalog)
+    quests = QuestCatalog()
+    for quest_dict in iter_quests(filename):
+        quests[quest_dict['quest_id']] = quest_dict
     return quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load item data from file
 
@@ -68,53 +383,75 @@ def load_items(filename="data/items.txt"):
     ITEM_ID: unique_item_name
     NAME: Item Display Name
     TYPE: weapon|armor|consumable
-    EFFECT: stat_name:value (e.g., strength:5 or health:20)
+    EFFECT: stat_name:value (e.g., strength:5 or health:20,
+            or several joined by commas, e.g. strength:5,magic:3)
     COST: 100
     DESCRIPTION: Item description
 
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Args:
+        filename: Path to the item data file
+        use_cache: If True, load from (and maintain) a compiled snapshot
+                   of the catalog stored next to the file
+
+    Returns: ItemCatalog (a dictionary) of items {item_id: ItemRecord}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    if use_cache:
+        return _load_with_cache(filename, "Item", load_items, ItemRecord, ItemCatalog)
+    items = ItemCatalog()
+    for item_dict in iter_items(filename):
+        # Insert into dictionary using item_id as key
+        items[item_dict['item_id']] = item_dict
 
-    # Validate file exists
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item data file '{filename}' not found.")
+    # Handle empty file
+    if not items:
+        raise CorruptedDataError(f"Item data file '{filename}' is empty or corrupted.")
 
-    items = {}
-
-    try:
-        with open(filename, 'r') as file:
-            content = file.read().strip()
-
-            # Handle empty file
-            if not content:
-                raise CorruptedDataError(f"Item data file '{filename}' is empty or corrupted.")
-
-            item_blocks = content.split('\n\n')
-
-            for block in item_blocks:
-                lines = block.strip().split('\n')
+    return items
 
-                if not lines:
-                    continue  # Skip accidental empty block
+# ============================================================================
+# STREAMING LOADERS
+# ============================================================================
 
-                # Parse each block into an item dictionary
-                item_dict = parse_item_block(lines)
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one validated record at a time
 
-                # Validate expected fields and types
-                validate_item_data(item_dict)
+    Reads the file line by line, so memory use stays flat no matter
+    how large the catalog is.
 
-                # Insert into dictionary using item_id as key
-                items[item_dict['item_id']] = item_dict
+    Yields: QuestRecord objects in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest data file '{filename}' not found.")
+    for line_number, lines in _iter_data_blocks(filename, "Quest"):
+        try:
+            quest_dict = parse_quest_block(lines)
+            validate_quest_data(quest_dict)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{filename}, line {line_number}: {e}")
+        yield QuestRecord.from_dict(quest_dict)
 
-    except IOError:
-        raise CorruptedDataError(f"Item data file '{filename}' is corrupted or unreadable.")
+def iter_items(filename="data/items.txt"):
+    """
+    Stream items from file one validated record at a time
 
-    except InvalidDataFormatError:
-        # Let validation/parsing errors propagate for clarity
-        raise
+    Reads the file line by line, so memory use stays flat no matter
+    how large the catalog is.
 
-    return items
+    Yields: ItemRecord objects in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item data file '{filename}' not found.")
+    for line_number, lines in _iter_data_blocks(filename, "Item"):
+        try:
+            item_dict = parse_item_block(lines)
+            validate_item_data(item_dict)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{filename}, line {line_number}: {e}")
+        yield ItemRecord.from_dict(item_dict)
 
 def validate_quest_data(quest_dict):
     """
@@ -148,10 +485,13 @@ def validate_item_data(item_dict):
     Validate that item dictionary has all required fields
     
     Required fields: item_id, name, type, effect, cost, description
+    Optional fields: stack (units per inventory slot, default 1)
     Valid types: weapon, armor, consumable
+    Effects must compile with compile_item_effect
     
     Returns: True if valid
-    Raises: InvalidDataFormatError if missing required fields or invalid type
+    Raises: InvalidDataFormatError if missing required fields, invalid type
+            or invalid effect
     """
     # TODO: Implement validation
     # Check that all required keys exist
@@ -163,6 +503,9 @@ def validate_item_data(item_dict):
 
     if item_dict['type'] not in valid_types:
         raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
+    if 'stack' in item_dict and (not isinstance(item_dict['stack'], int) or item_dict['stack'] < 1):
+        raise InvalidDataFormatError(f"Invalid stack size: {item_dict['stack']}")
+    compile_item_effect(item_dict['effect'])
     return True
 
 def create_default_data_files():
@@ -211,10 +554,413 @@ def create_default_data_files():
         with open(item_file, 'w') as f:
             f.write(default_items)
 
+# ============================================================================
+# SHARDED DATA DIRECTORIES
+# ============================================================================
+
+def load_catalog_dir(directory, kind="item", workers=None):
+    """
+    Load every shard file (*.txt) in a directory and merge them
+
+    Shards are parsed and validated in parallel worker processes, then
+    merged in sorted filename order. Workers send back packed columns
+    (see _pack_records) rather than pickled records, so the parent only
+    has to rebuild the records in bulk and merge whole shards.
+
+    Args:
+        directory: Directory holding the shards, e.g. "data/items"
+        kind: "quest" or "item"
+        workers: Number of worker processes (default: one per CPU).
+                 With 1 worker, or a single shard, loading is serial.
+
+    Returns: QuestCatalog or ItemCatalog {id: record} across all shards
+    Raises:
+        MissingDataFileError if the directory has no shards
+        InvalidDataFormatError for bad data (message names the shard
+        and line) or an id defined in more than one shard
+        CorruptedDataError if a shard can't be read
+    """
+    if kind not in ('quest', 'item'):
+        raise ValueError(f"Unknown catalog kind: {kind}")
+    label = "Quest" if kind == 'quest' else "Item"
+    id_key = f"{kind}_id"
+    record_type = QuestRecord if kind == 'quest' else ItemRecord
+
+    shards = sorted(glob.glob(os.path.join(directory, "*.txt")))
+    if not shards:
+        raise MissingDataFileError(f"No {label.lower()} data files found in '{directory}'.")
+
+    if workers == 1 or len(shards) == 1:
+        results = [_load_shard(shard, kind) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_shard, shards, [kind] * len(shards)))
+
+    catalog = QuestCatalog() if kind == 'quest' else ItemCatalog()
+    shard_ids = []
+    with _gc_paused():
+        for shard, snapshot in zip(shards, results):
+            ids, records = _unpack_records(snapshot, record_type)
+            expected_size = len(catalog) + len(ids)
+            catalog.update(zip(ids, records))
+            shard_ids.append(ids)
+            if len(catalog) != expected_size:
+                _raise_duplicate_id(id_key, shards, shard_ids)
+    return catalog
+
+def _raise_duplicate_id(id_key, shards, shard_ids):
+    """Find the first id defined twice across the merged shards and report it"""
+    origins = {}
+    for shard, ids in zip(shards, shard_ids):
+        for record_id in ids:
+            if record_id in origins:
+                raise InvalidDataFormatError(
+                    f"Duplicate {id_key} '{record_id}' in '{shard}' "
+                    f"(already defined in '{origins[record_id]}')")
+            origins[record_id] = shard
+
+def _load_shard(filename, kind):
+    """
+    Parse and validate one shard file (runs in a worker process)
+
+    Returns: The shard's records packed by _pack_records
+    """
+    if kind == 'quest':
+        return _pack_records(list(iter_quests(filename)), QuestRecord)
+    return _pack_records(list(iter_items(filename)), ItemRecord)
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cycle collector while building many acyclic records
+
+    Otherwise it keeps rescanning the heap as the records pile up.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+# ============================================================================
+# COLUMNAR VIEW
+# ============================================================================
+
+def to_columns(catalog, kind=None):
+    """
+    Build a structure-of-arrays view of a catalog for vectorized analytics
+
+    Row i of every column belongs to columns['ids'][i].
+
+    Quest columns: reward_xp, reward_gold, required_level (int64 arrays)
+    and prerequisite (int32 codes into prerequisite_categories).
+    Item columns: cost and stack (int64), type (int32 codes into
+    type_categories) and effect_<stat> (int64 bonus per stat in
+    VALID_EFFECT_STATS).
+
+    Args:
+        catalog: Quest or item catalog {id: record}
+        kind: "quest" or "item"; inferred from the records when None
+
+    Returns: Dictionary of column name -> list or NumPy array
+    Raises:
+        ImportError if NumPy is not installed
+        ValueError if kind can't be inferred (empty catalog)
+    """
+    if np is None:
+        raise ImportError("to_columns requires NumPy (pip install numpy)")
+    records = list(catalog.values())
+    if kind is None:
+        if not records:
+            raise ValueError("Cannot infer the kind of an empty catalog; pass kind.")
+        kind = 'quest' if 'quest_id' in records[0] else 'item'
+    count = len(records)
+
+    def int_column(field, dtype=np.int64):
+        return np.fromiter((record[field] for record in records), dtype=dtype, count=count)
+
+    def category_column(field):
+        categories = {}
+        codes = np.fromiter(
+            (categories.setdefault(record[field], len(categories)) for record in records),
+            dtype=np.int32, count=count)
+        return codes, list(categories)
+
+    if kind == 'quest':
+        columns = {
+            'ids': [record['quest_id'] for record in records],
+            'reward_xp': int_column('reward_xp'),
+            'reward_gold': int_column('reward_gold'),
+            'required_level': int_column('required_level'),
+        }
+        columns['prerequisite'], columns['prerequisite_categories'] = category_column('prerequisite')
+        return columns
+
+    columns = {
+        'ids': [record['item_id'] for record in records],
+        'cost': int_column('cost'),
+        'stack': np.fromiter((record.get('stack', 1) for record in records),
+                             dtype=np.int64, count=count),
+    }
+    columns['type'], columns['type_categories'] = category_column('type')
+    stat_positions = {stat: position for position, stat in enumerate(VALID_EFFECT_STATS)}
+    effects = np.zeros((count, len(VALID_EFFECT_STATS)), dtype=np.int64)
+    for row, record in enumerate(records):
+        effect = getattr(record, 'compiled_effect', None) or compile_item_effect(record['effect'])
+        for stat_name, value in effect.modifiers:
+            effects[row, stat_positions[stat_name]] += value
+    for stat, position in stat_positions.items():
+        columns[f'effect_{stat}'] = effects[:, position]
+    return columns
+
+# ============================================================================
+# COMPILED CATALOG CACHE
+# ============================================================================
+
+def _load_with_cache(filename, label, loader, record_type, catalog_type):
+    """
+    Load a catalog from its compiled snapshot, rebuilding it when stale
+
+    The snapshot lives at filename + CACHE_SUFFIX: a length-prefixed
+    marshal header followed by the catalog stored column by column (see
+    _pack_records). It is used when the source file's size and mtime
+    match the ones recorded in it. If only the mtime differs, the source
+    is hashed and the snapshot is still used (and re-stamped) when the
+    content is unchanged.
+
+    Args:
+        filename: Path to the source data file
+        label: "Quest" or "Item", used in error messages
+        loader: load_quests or load_items, used to rebuild the catalog
+        record_type: QuestRecord or ItemRecord
+        catalog_type: QuestCatalog or ItemCatalog
+
+    Returns: Catalog dictionary {id: record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"{label} data file '{filename}' not found.")
+    cache_file = filename + CACHE_SUFFIX
+    stat = os.stat(filename)
+
+    header, columns = _read_snapshot(cache_file)
+    if header is not None and header[2] == stat.st_size:
+        if header[1] != stat.st_mtime_ns:
+            digest = _hash_file(filename)
+            if header[3] != digest:
+                columns = None
+            else:
+                _write_snapshot(cache_file, stat, digest, columns)
+        if columns is not None:
+            with _gc_paused():
+                return catalog_type(zip(*_unpack_records(columns, record_type)))
+
+    catalog = loader(filename)
+    columns = _pack_records(list(catalog.values()), record_type)
+    _write_snapshot(cache_file, stat, _hash_file(filename), columns)
+    return catalog
+
+def _pack_records(records, record_type):
+    """
+    Pack records for a snapshot or a shard result
+
+    Returns: Tuple of (count, columns, extras), where columns come from
+             _pack_columns and extras from record_type.pack_extras
+    """
+    count, columns = _pack_columns(records, record_type.FIELDS)
+    return count, columns, record_type.pack_extras(records)
+
+def _unpack_records(snapshot, record_type):
+    """
+    Reverse _pack_records
+
+    Returns: Tuple of (ids, records) as two aligned lists
+    """
+    count, columns, extras = snapshot
+    values = _unpack_columns((count, columns))
+    return values[0], record_type.from_columns(values, extras)
+
+def _pack_columns(records, fields):
+    """
+    Store records as one packed column per field
+
+    Text columns become a single newline-joined string and integer
+    columns a block of int64s, so reading them back is one split() or
+    one array copy instead of unmarshalling every value separately.
+    Text columns where most values repeat (types, effects) store each
+    distinct value once plus an index per record, so the records share
+    one string per value. Columns that fit none of these forms are kept
+    as plain lists.
+
+    Returns: Tuple of (count, [(kind, data), ...]) in fields order
+    """
+    columns = []
+    for field in fields:
+        values = [getattr(record, field) for record in records]
+        kinds = set(map(type, values))
+        if kinds == {str}:
+            distinct = list(dict.fromkeys(values))
+            joined = "\n".join(distinct)
+            if joined.count("\n") == len(distinct) - 1:
+                if len(distinct) * 2 <= len(values):
+                    positions = {value: index for index, value in enumerate(distinct)}
+                    indexes = array('q', map(positions.__getitem__, values))
+                    columns.append(('c', (joined, indexes.tobytes())))
+                else:
+                    columns.append(('s', "\n".join(values)))
+                continue
+        elif kinds == {int}:
+            try:
+                columns.append(('q', array('q', values).tobytes()))
+                continue
+            except OverflowError:
+                pass
+        columns.append(('v', values))
+    return len(records), columns
+
+def _unpack_columns(snapshot):
+    """Reverse _pack_columns, returning one list of values per field"""
+    count, columns = snapshot
+    values = []
+    for kind, data in columns:
+        if kind == 's':
+            column = data.split("\n") if count else []
+        elif kind == 'c':
+            distinct = [sys.intern(value) for value in data[0].split("\n")]
+            column = list(map(distinct.__getitem__, array('q', data[1])))
+        elif kind == 'q':
+            column = array('q', data).tolist()
+        else:
+            column = data
+        values.append(column)
+    return values
+
+def _read_snapshot(cache_file):
+    """
+    Read a compiled snapshot
+
+    Returns: Tuple of (header, columns), or (None, None) if the snapshot
+             is missing, unreadable or from another CACHE_VERSION
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            header_size = struct.unpack('<I', f.read(4))[0]
+            header = marshal.loads(f.read(header_size))
+            if not isinstance(header, tuple) or header[0] != CACHE_VERSION:
+                return None, None
+            return header, marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError, IndexError, struct.error):
+        return None, None
+
+def _write_snapshot(cache_file, stat, digest, columns):
+    """
+    Atomically write a compiled snapshot next to its source file
+
+    Failing to write the snapshot is not an error; the next load will
+    simply parse the source again.
+    """
+    header = marshal.dumps((CACHE_VERSION, stat.st_mtime_ns, stat.st_size, digest))
+    directory = os.path.dirname(cache_file) or "."
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(struct.pack('<I', len(header)) + header + marshal.dumps(columns))
+            os.replace(temp_path, cache_file)
+        except (OSError, ValueError):
+            os.remove(temp_path)
+    except OSError:
+        pass
+
+def _hash_file(filename):
+    """Return a hex digest of a file's contents, read in chunks"""
+    digest = hashlib.blake2b()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_data_blocks(filename, label):
+    """
+    Read a data file line by line and yield its blank-line separated blocks
+
+    Args:
+        filename: Path to the data file
+        label: "Quest" or "Item", used in error messages
+
+    Yields: Tuples of (first_line_number, list_of_lines) for each block
+    Raises: CorruptedDataError if the file can't be read
+    """
+    try:
+        with open(filename, 'r') as file:
+            lines = []
+            start_line = 0
+            for line_number, line in enumerate(file, start=1):
+                line = line.rstrip('\r\n')
+                if line.strip():
+                    if not lines:
+                        start_line = line_number
+                    lines.append(line)
+                elif lines:
+                    yield start_line, lines
+                    lines = []
+            if lines:
+                yield start_line, lines
+    except (IOError, UnicodeDecodeError):
+        raise CorruptedDataError(f"{label} data file '{filename}' is corrupted or unreadable.")
+
+def compile_item_effect(effect_string):
+    """
+    Compile an EFFECT string into an ItemEffect
+
+    Args:
+        effect_string: "stat_name:value", or several separated by commas
+                       (e.g. "strength:5,magic:3"). May be empty.
+
+    Returns: ItemEffect (shared for identical effect strings)
+    Raises: InvalidDataFormatError if the format is wrong or a stat is
+            not in VALID_EFFECT_STATS
+    """
+    effect = _compiled_effects.get(effect_string)
+    if effect is not None:
+        return effect
+    modifiers = []
+    for part in effect_string.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        stat_name, separator, value = part.partition(':')
+        stat_name = stat_name.strip()
+        if not separator:
+            raise InvalidDataFormatError(f"Invalid effect format: {part}")
+        if stat_name not in VALID_EFFECT_STATS:
+            raise InvalidDataFormatError(f"Unknown effect stat: {stat_name}")
+        try:
+            modifiers.append((sys.intern(stat_name), int(value)))
+        except ValueError:
+            raise InvalidDataFormatError(f"Expected integer for effect {stat_name}, got '{value.strip()}'")
+    effect = ItemEffect(modifiers)
+    _compiled_effects[effect_string] = effect
+    return effect
+
+def _restore_item_effect(effect_string, modifiers):
+    """
+    Rebuild a compiled effect from modifiers saved by ItemRecord.pack_extras
+
+    Returns: ItemEffect (shared with compile_item_effect)
+    """
+    effect = _compiled_effects.get(effect_string)
+    if effect is None:
+        effect = ItemEffect([(sys.intern(stat_name), value) for stat_name, value in modifiers])
+        _compiled_effects[effect_string] = effect
+    return effect
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -263,7 +1009,7 @@ def parse_item_block(lines):
         key, value = line.split(': ', 1)
         key = key.strip().lower()
         value = value.strip()
-        if key in ['cost']:
+        if key in ['cost', 'stack']:
             try:
                 value = int(value)
             except ValueError:
@@ -271,6 +1017,283 @@ def parse_item_block(lines):
         item_block[key] = value
     return item_block
 
+# ============================================================================
+# LAZY CATALOG
+# ============================================================================
+
+# kind -> (id field, label for messages, block parser, validator, record type)
+_CATALOG_KINDS = {
+    'quest': ('quest_id', "Quest", parse_quest_block, validate_quest_data, QuestRecord),
+    'item': ('item_id', "Item", parse_item_block, validate_item_data, ItemRecord),
+}
+
+class LazyCatalog(Mapping):
+    """
+    Read-only catalog that decodes records only when they are accessed
+
+    The data file is memory-mapped and scanned once to build an
+    id -> (offset, length) index. A record is parsed and validated the
+    first time catalog[record_id] is used, and the most recently used
+    records are kept in a bounded cache.
+
+    Supports the same in / [] / iteration / .get / .items semantics as
+    the dictionaries returned by load_quests and load_items.
+    """
+
+    def __init__(self, filename, kind="item", cache_size=1024):
+        """
+        Open and index a catalog file
+
+        Args:
+            filename: Path to the quest or item data file
+            kind: "quest" or "item"
+            cache_size: Maximum number of decoded records to keep
+
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if kind not in _CATALOG_KINDS:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        self.filename = filename
+        self.kind = kind
+        self.cache_size = cache_size
+        (self._id_key, self._label, self._parse_block,
+         self._validate, self._record_type) = _CATALOG_KINDS[kind]
+        self._index = {}
+        self._cache = OrderedDict()
+
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"{self._label} data file '{filename}' not found.")
+        try:
+            self._file = open(filename, 'rb')
+        except IOError:
+            raise CorruptedDataError(f"{self._label} data file '{filename}' is corrupted or unreadable.")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise CorruptedDataError(f"{self._label} data file '{filename}' is empty or corrupted.")
+        self._build_index()
+
+    def _build_index(self):
+        """Scan the mapped file once, recording where each record's block lives"""
+        id_key = self._id_key.encode()
+        data = self._map
+        record_id = None
+        block_start = None
+        block_end = 0
+        start_line = 0
+        line_number = 0
+        while True:
+            offset = data.tell()
+            line = data.readline()
+            if not line:
+                break
+            line_number += 1
+            if line.strip():
+                if block_start is None:
+                    block_start = offset
+                    start_line = line_number
+                block_end = data.tell()
+                key, separator, value = line.partition(b': ')
+                if separator and key.strip().lower() == id_key:
+                    record_id = value.strip().decode()
+            elif block_start is not None:
+                self._add_to_index(record_id, block_start, block_end, start_line)
+                record_id = None
+                block_start = None
+        if block_start is not None:
+            self._add_to_index(record_id, block_start, block_end, start_line)
+
+    def _add_to_index(self, record_id, block_start, block_end, start_line):
+        """Record one block's location, rejecting blocks without an id"""
+        if record_id is None:
+            raise InvalidDataFormatError(
+                f"{self.filename}, line {start_line}: Missing required "
+                f"{self._label.lower()} field: {self._id_key}")
+        self._index[record_id] = (block_start, block_end - block_start)
+
+    def __getitem__(self, record_id):
+        cache = self._cache
+        if record_id in cache:
+            cache.move_to_end(record_id)
+            return cache[record_id]
+        offset, length = self._index[record_id]
+        try:
+            lines = self._map[offset:offset + length].decode().splitlines()
+        except UnicodeDecodeError:
+            raise CorruptedDataError(f"{self._label} data file '{self.filename}' is corrupted or unreadable.")
+        try:
+            data = self._parse_block(lines)
+            self._validate(data)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{self.filename}, byte {offset}: {e}")
+        record = self._record_type.from_dict(data)
+        cache[record_id] = record
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return record
+
+    def __contains__(self, record_id):
+        return record_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        self._cache.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keep a live catalog in sync with its data file
+
+    Each block's content hash is remembered, so when the file changes
+    only new or edited blocks are parsed and validated again. The
+    resulting diff is applied to a copy of the catalog, which then
+    replaces self.catalog in a single assignment. Readers that grabbed
+    watcher.catalog keep a consistent catalog the whole time.
+    """
+
+    def __init__(self, filename, kind="item", on_change=None):
+        """
+        Load the catalog and start tracking its file
+
+        Args:
+            filename: Path to the quest or item data file
+            kind: "quest" or "item"
+            on_change: Optional callback(diff) run after each applied change
+
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if kind not in _CATALOG_KINDS:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        self.filename = filename
+        self.kind = kind
+        self.on_change = on_change
+        self.last_error = None
+        self.catalog = QuestCatalog() if kind == 'quest' else ItemCatalog()
+        self._block_hashes = {}
+        self._file_state = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self.reload()
+
+    def _file_signature(self):
+        if not os.path.exists(self.filename):
+            label = _CATALOG_KINDS[self.kind][1]
+            raise MissingDataFileError(f"{label} data file '{self.filename}' not found.")
+        stat = os.stat(self.filename)
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self):
+        """
+        Reload the catalog if its file changed since the last check
+
+        Returns: The applied diff (see reload), or None if unchanged
+        Raises: MissingDataFileError, InvalidDataFormatError,
+                CorruptedDataError (the live catalog is left as it was)
+        """
+        if self._file_signature() == self._file_state:
+            return None
+        return self.reload()
+
+    def reload(self):
+        """
+        Re-read the file, re-parsing only blocks whose content changed
+
+        Returns: Dictionary with 'added', 'removed' and 'changed' id lists
+        Raises: MissingDataFileError, InvalidDataFormatError,
+                CorruptedDataError (the live catalog is left as it was)
+        """
+        file_state = self._file_signature()
+        id_key, label, parse_block, validate, record_type = _CATALOG_KINDS[self.kind]
+        old_hashes = self._block_hashes
+        new_hashes = {}
+        updates = {}
+        for line_number, lines in _iter_data_blocks(self.filename, label):
+            digest = hashlib.blake2b("\n".join(lines).encode(), digest_size=16).digest()
+            record_id = _block_record_id(lines, id_key)
+            if record_id is not None and old_hashes.get(record_id) == digest:
+                new_hashes[record_id] = digest
+                continue
+            try:
+                data = parse_block(lines)
+                validate(data)
+            except InvalidDataFormatError as e:
+                raise InvalidDataFormatError(f"{self.filename}, line {line_number}: {e}")
+            record = record_type.from_dict(data)
+            new_hashes[record[id_key]] = digest
+            updates[record[id_key]] = record
+
+        diff = {
+            'added': [record_id for record_id in updates if record_id not in old_hashes],
+            'removed': [record_id for record_id in old_hashes if record_id not in new_hashes],
+            'changed': [record_id for record_id in updates if record_id in old_hashes],
+        }
+        catalog = self.catalog.copy()
+        for record_id in diff['removed']:
+            del catalog[record_id]
+        catalog.update(updates)
+
+        self.catalog = catalog
+        self._block_hashes = new_hashes
+        self._file_state = file_state
+        if self.on_change is not None and any(diff.values()):
+            self.on_change(diff)
+        return diff
+
+    def start(self, interval=1.0):
+        """
+        Poll the file every interval seconds on a background thread
+
+        Errors during a background poll are stored in last_error and
+        the live catalog is kept.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background polling thread"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _watch(self, interval):
+        while not self._stop_event.wait(interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except DataError as e:
+                self.last_error = e
+
+def _block_record_id(lines, id_key):
+    """Find a block's id from its QUEST_ID/ITEM_ID line without a full parse"""
+    for line in lines:
+        key, separator, value = line.partition(': ')
+        if separator and key.strip().lower() == id_key:
+            return value.strip()
+    return None
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -9,28 +9,210 @@ AI Usage: [Document any AI assistance used]
 This module handles inventory management, item usage, and equipment.
 """
 
+from contextlib import contextmanager
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
     InsufficientResourcesError,
-    InvalidItemTypeError
+    InvalidItemTypeError,
+    InvalidDataFormatError
 )
+from game_data import compile_item_effect, VALID_EFFECT_STATS
 
-# Maximum inventory size
+# Maximum inventory size, in slots
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================
+# INVENTORY TYPE
+# ============================================================================
+
+class Inventory:
+    """
+    Multiset of item ids backed by an insertion-ordered count dictionary
+
+    Stands in for the inventory list. It supports append, extend,
+    remove, count, clear, copy, in, len, iteration, indexing and
+    slicing, + and += like a list, but count, membership, append and
+    remove are O(1). add(item_id, quantity) adds and remove(item_id,
+    quantity) removes a whole stack at once.
+
+    add(item_id, quantity, stack) also records how many units of the
+    item share one slot, so slots can be counted from the inventory
+    alone (see get_slots_used). A recorded stack size is kept after
+    the last unit is removed, so an item that is equipped and later
+    unequipped still stacks correctly.
+
+    Order is by item, not by position: iteration yields each item id
+    once per copy, grouped in the order items were first added, and
+    equality with a list ignores order. Indexing walks that order, so it
+    is O(n). Methods that place items at a position (insert, pop,
+    sort, reverse, item assignment) are not supported.
+    """
+
+    __slots__ = ('_counts', '_size', '_stacks')
+
+    def __init__(self, items=()):
+        self._counts = {}
+        self._size = 0
+        # item_id -> units per slot, for items added with a stack size
+        self._stacks = {}
+        for item_id in items:
+            self.append(item_id)
+
+    def append(self, item_id):
+        """Add one item_id"""
+        self._counts[item_id] = self._counts.get(item_id, 0) + 1
+        self._size += 1
+
+    def extend(self, item_ids):
+        """Add every item id in an iterable (and the stack sizes of an Inventory)"""
+        if isinstance(item_ids, Inventory):
+            self._stacks.update(item_ids._stacks)
+            for item_id, count in list(item_ids.items()):
+                self.add(item_id, count)
+            return
+        for item_id in item_ids:
+            self.append(item_id)
+
+    def add(self, item_id, quantity=1, stack=None):
+        """
+        Add quantity copies of item_id
+
+        stack, if given, is the item's units per slot and is recorded
+        for stack_size().
+        """
+        if quantity < 1:
+            raise ValueError(f"Quantity must be positive, got {quantity}")
+        if stack is not None:
+            self.set_stack_size(item_id, stack)
+        self._counts[item_id] = self._counts.get(item_id, 0) + quantity
+        self._size += quantity
+
+    def set_stack_size(self, item_id, stack):
+        """Record how many units of item_id share one slot"""
+        if stack < 1:
+            raise ValueError(f"Stack size must be positive, got {stack}")
+        self._stacks[item_id] = stack
+
+    def stack_size(self, item_id):
+        """Units of item_id per slot, as recorded (1 if never recorded)"""
+        return self._stacks.get(item_id, 1)
+
+    def remove(self, item_id, quantity=1):
+        """
+        Remove quantity copies of item_id (one by default)
+
+        Raises: ValueError if quantity isn't positive or there are fewer
+                than quantity (like list.remove)
+        """
+        if quantity < 1:
+            raise ValueError(f"Quantity must be positive, got {quantity}")
+        count = self._counts.get(item_id, 0)
+        if count < quantity:
+            raise ValueError(f"{item_id!r} not in inventory")
+        if count == quantity:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = count - quantity
+        self._size -= quantity
+
+    def count(self, item_id):
+        """Number of item_id held"""
+        return self._counts.get(item_id, 0)
+
+    def items(self):
+        """(item_id, quantity) pairs in first-added order"""
+        return self._counts.items()
+
+    def clear(self):
+        self._counts.clear()
+        self._size = 0
+
+    def copy(self):
+        inventory = Inventory()
+        inventory._counts = dict(self._counts)
+        inventory._size = self._size
+        inventory._stacks = dict(self._stacks)
+        return inventory
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("inventory index out of range")
+        for item_id, count in self._counts.items():
+            if index < count:
+                return item_id
+            index -= count
+
+    def __add__(self, other):
+        inventory = self.copy()
+        inventory.extend(other)
+        return inventory
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for item_id, count in self._counts.items():
+            for _ in range(count):
+                yield item_id
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._size and self._counts == item_counts(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
+
+def item_counts(inventory):
+    """
+    Get {item_id: quantity} for an Inventory or a plain inventory list
+
+    Returns: Dictionary in first-added order
+    """
+    if isinstance(inventory, Inventory):
+        return dict(inventory.items())
+    counts = {}
+    for item_id in inventory:
+        counts[item_id] = counts.get(item_id, 0) + 1
+    return counts
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
 
-def add_item_to_inventory(character, item_id):
+def add_item_to_inventory(character, item_id, item_data=None, item_data_dict=None):
     """
     Add an item to character's inventory
     
     Args:
         character: Character dictionary
         item_id: Unique item identifier
+        item_data: Item information (for its stack size), optional
+        item_data_dict: All item data, for stack sizes (see
+                        get_slots_used), optional
     
+    Copies of a stackable item fill up the existing stack before a new
+    slot is used.
+
     Returns: True if added successfully
     Raises: InventoryFullError if inventory is at max capacity
     """
@@ -38,10 +220,12 @@ def add_item_to_inventory(character, item_id):
     # Check if inventory is full (>= MAX_INVENTORY_SIZE)
     # Add item_id to character['inventory'] list
     
-    if len(character['inventory']) >= MAX_INVENTORY_SIZE:
+    if item_data is None and item_data_dict is not None:
+        item_data = item_data_dict.get(item_id)
+    if not _has_room_for(character, item_id, item_data, item_data_dict):
         raise InventoryFullError("Inventory is full.")
     else:
-        character['inventory'].append(item_id)
+        _add_units(character['inventory'], item_id, 1, item_data)
         return True
 
 def remove_item_from_inventory(character, item_id):
@@ -86,13 +270,84 @@ def count_item(character, item_id):
     # Use list.count() method
     return character['inventory'].count(item_id)
 
-def get_inventory_space_remaining(character):
+def get_inventory_space_remaining(character, item_data_dict=None):
     """
     Calculate how many more items can fit in inventory
     
     Returns: Integer representing available slots
     """
-    return MAX_INVENTORY_SIZE - len(character['inventory'])
+    return MAX_INVENTORY_SIZE - get_slots_used(character, item_data_dict)
+
+def get_slots_used(character, item_data_dict=None):
+    """
+    Count the inventory slots in use
+
+    Each item takes ceil(quantity / stack) slots. Proportional to the
+    number of distinct items, not units.
+
+    Stack sizes are the ones an Inventory recorded when the items were
+    added by this module (from their item data), so no item data is
+    needed here. item_data_dict, if given, takes precedence. Items in a
+    plain list inventory that are not in item_data_dict take one slot
+    per unit.
+
+    Args:
+        character: Character dictionary
+        item_data_dict: All item data, optional
+
+    Returns: Number of slots used
+    """
+    inventory = character['inventory']
+    return _count_slots(item_counts(inventory),
+                        lambda item_id: _stack_size(inventory, item_id, item_data_dict))
+
+def _stack_size(inventory, item_id, item_data_dict=None, item_data=None):
+    """
+    Units of item_id per slot: from item_data, else item_data_dict,
+    else as recorded in the Inventory
+    """
+    if item_data is None and item_data_dict is not None:
+        item_data = item_data_dict.get(item_id)
+    if item_data is not None:
+        return get_stack_limit(item_data)
+    if isinstance(inventory, Inventory):
+        return inventory.stack_size(item_id)
+    return 1
+
+def _count_slots(counts, stack_size):
+    """Slots needed for {item_id: quantity}, given stack_size(item_id)"""
+    slots = 0
+    for item_id, count in counts.items():
+        slots += -(-count // stack_size(item_id))
+    return slots
+
+def _has_room_for(character, item_id, item_data=None, item_data_dict=None):
+    """True if one more item_id fits, filling its last stack first"""
+    inventory = character['inventory']
+    if not needs_new_slot(character, item_id, item_data, item_data_dict):
+        return True
+
+    def stack_size(counted_id):
+        data = item_data if counted_id == item_id else None
+        return _stack_size(inventory, counted_id, item_data_dict, data)
+    return _count_slots(item_counts(inventory), stack_size) < MAX_INVENTORY_SIZE
+
+def needs_new_slot(character, item_id, item_data=None, item_data_dict=None):
+    """True if adding one item_id would start a new stack"""
+    inventory = character['inventory']
+    stack = _stack_size(inventory, item_id, item_data_dict, item_data)
+    return inventory.count(item_id) % stack == 0
+
+def get_stack_limit(item_data=None):
+    """
+    Units of an item that share one slot
+
+    Read from the item's STACK; items without one, or with no item data,
+    stack to 1.
+    """
+    if item_data is None:
+        return 1
+    return item_data.get('stack', 1)
 
 def clear_inventory(character):
     """
@@ -103,7 +358,7 @@ def clear_inventory(character):
     # TODO: Implement inventory clearing
     # Save current inventory before clearing
     # Clear character's inventory list
-    removed_items = character['inventory'][:]
+    removed_items = list(character['inventory'])
     character['inventory'].clear()
     return removed_items
 
@@ -123,6 +378,9 @@ def use_item(character, item_id, item_data):
     Item types and effects:
     - consumable: Apply effect and remove from inventory
     - weapon/armor: Cannot be "used", only equipped
+
+    Consumable effects are permanent changes to the base stats; use
+    add_modifier for temporary buffs.
     
     Returns: String describing what happened
     Raises: 
@@ -139,12 +397,8 @@ def use_item(character, item_id, item_data):
         if item_data['type'] != 'consumable':
             raise InvalidItemTypeError
         else:
-            # Parse effect and apply to character
-            effect = item_data.get('effect', '')
-            if effect:
-                stat = effect.split(':')[0]
-                value = effect.split(':')[1]
-                character[stat] += int(value)
+            # Apply the precompiled effect to character
+            apply_item_effect(character, get_item_effect(item_data))
             # Remove item from inventory
             character['inventory'].remove(item_id)
             return f"Used {item_id}."
@@ -166,26 +420,16 @@ def equip_weapon(character, item_id, item_data):
     If character already has weapon equipped:
     - Unequip current weapon (remove bonus)
     - Add old weapon back to inventory
+
+    The bonus is added as the 'equipped_weapon' modifier (see
+    add_modifier), so unequipping removes exactly what was added.
     
     Returns: String describing equipment change
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'weapon'
     """
-    # TODO: Implement weapon equipping
-    # Check item exists and is type 'weapon'
-    # Handle unequipping current weapon if exists
-    # Parse effect and apply to character stats
-    # Store equipped_weapon in character dictionary
-    # Remove item from inventory
-    character['equipped_weapon'] = item_id
-    character['inventory'].remove(item_id)
-    weapon_effect = item_data.get('effect', '')
-    if weapon_effect:
-        stat = weapon_effect.split(':')[0]
-        value = weapon_effect.split(':')[1]
-        character[stat] += int(value)
-    return f"Equipped {item_id}."
+    return _equip(character, item_id, item_data, 'weapon', 'equipped_weapon')
 
 def equip_armor(character, item_id, item_data):
     """
@@ -201,30 +445,47 @@ def equip_armor(character, item_id, item_data):
     If character already has armor equipped:
     - Unequip current armor (remove bonus)
     - Add old armor back to inventory
+
+    The bonus is added as the 'equipped_armor' modifier.
     
     Returns: String describing equipment change
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'armor'
     """
-    # TODO: Implement armor equipping
-    # Similar to equip_weapon but for armor
-    if item_id in character['inventory']:
-        if item_data.get('type') != 'armor':
-            raise InvalidItemTypeError(f"Item {item_id} is not armor.")
-        if character['equipped_armor']:
-            old_armor = unequip_armor(character)
-            character['inventory'].append(old_armor)
-            character['equipped_armor'] = item_id
-            character['inventory'].remove(item_id)
-            return f"Equipped {item_id}."
-    else:
+    return _equip(character, item_id, item_data, 'armor', 'equipped_armor')
+
+def _equip(character, item_id, item_data, item_type, slot):
+    """Equip item_id into slot ('equipped_weapon' or 'equipped_armor')"""
+    if item_id not in character['inventory']:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory.")
+    if item_data.get('type') != item_type:
+        raise InvalidItemTypeError(f"Item {item_id} is not {item_type}.")
+    # Take the new item out first so the old one always has room
+    inventory = character['inventory']
+    inventory.remove(item_id)
+    if isinstance(inventory, Inventory):
+        # Kept after the last unit is removed, for when it is unequipped
+        inventory.set_stack_size(item_id, get_stack_limit(item_data))
+    try:
+        if character.get(slot):
+            _unequip(character, slot)
+    except InventoryFullError:
+        inventory.append(item_id)
+        raise
+    character[slot] = item_id
+    add_modifier(character, slot, get_item_effect(item_data))
+    return f"Equipped {item_id}."
 
-def unequip_weapon(character):
+def unequip_weapon(character, item_data_dict=None):
     """
     Remove equipped weapon and return it to inventory
     
+    Args:
+        character: Character dictionary
+        item_data_dict: All item data, for stack sizes (optional; an
+                        Inventory remembers them without it)
+    
     Returns: Item ID that was unequipped, or None if no weapon equipped
     Raises: InventoryFullError if inventory is full
     """
@@ -233,39 +494,107 @@ def unequip_weapon(character):
     # Remove stat bonuses
     # Add weapon back to inventory
     # Clear equipped_weapon from character
-    if character['equipped_weapon']:
-        weapon_id = character['equipped_weapon']
-        character['equipped_weapon'] = None
-        if len(character['inventory']) >= MAX_INVENTORY_SIZE:
-            raise InventoryFullError("Inventory is full.")
-        else:
-            character['inventory'].append(weapon_id)
-            return weapon_id
+    if character.get('equipped_weapon'):
+        return _unequip(character, 'equipped_weapon', item_data_dict)
     else:
         raise ItemNotFoundError("No weapon equipped.")
 
-def unequip_armor(character):
+def unequip_armor(character, item_data_dict=None):
     """
     Remove equipped armor and return it to inventory
     
+    Args:
+        character: Character dictionary
+        item_data_dict: All item data, for stack sizes (optional; an
+                        Inventory remembers them without it)
+    
     Returns: Item ID that was unequipped, or None if no armor equipped
     Raises: InventoryFullError if inventory is full
     """
     # TODO: Implement armor unequipping
-    if character['equipped_armor']:
-        past_armor_id = character['equipped_armor']
-        character['equipped_armor'] = None
-        if len(character['inventory']) >= MAX_INVENTORY_SIZE:
-            raise InventoryFullError("Inventory is full.")
-        else:
-            character['inventory'].append(past_armor_id)
-            return past_armor_id
+    if character.get('equipped_armor'):
+        return _unequip(character, 'equipped_armor', item_data_dict)
+    return None
+
+def _unequip(character, slot, item_data_dict=None):
+    """Move the item in slot back to the inventory and drop its modifier"""
+    item_id = character[slot]
+    if not _has_room_for(character, item_id, item_data_dict=item_data_dict):
+        raise InventoryFullError("Inventory is full.")
+    remove_modifier(character, slot)
+    character[slot] = None
+    character['inventory'].append(item_id)
+    return item_id
+
+# ============================================================================
+# STAT MODIFIERS
+# ============================================================================
+
+def add_modifier(character, source, effect):
+    """
+    Add a named, removable stat modifier (equipment, buffs)
+
+    character[stat] always holds the effective value - base plus every
+    active modifier - so combat and display code read it directly and
+    nothing is recomputed per read. Adding or removing a modifier
+    applies only its own deltas, so it costs O(stats in the effect)
+    whatever else is active, and removal is exact. A modifier already
+    registered under source is replaced.
+
+    Health is the exception: it never goes above max_health, so a
+    health bonus may be partly lost to the cap (see remove_modifier).
+
+    Args:
+        character: Character dictionary
+        source: Name of the modifier, e.g. 'equipped_weapon' or 'blessing'
+        effect: game_data.ItemEffect (see get_item_effect)
+    """
+    modifiers = character.setdefault('modifiers', {})
+    if source in modifiers:
+        remove_modifier(character, source)
+    modifiers[source] = effect.modifiers
+    for stat_name, value in effect.modifiers:
+        character[stat_name] += value
+    if character['health'] > character['max_health']:
+        character['health'] = character['max_health']
+
+def remove_modifier(character, source):
+    """
+    Remove the modifier added under source
+
+    Health is capped at the new max_health if that went down, and never
+    drops below 1: losing a buff can't kill the character.
+
+    Returns: The removed (stat, value) pairs, or None if there was none
+    """
+    modifiers = character.get('modifiers', {}).pop(source, None)
+    if modifiers is None:
+        return None
+    for stat_name, value in modifiers:
+        character[stat_name] -= value
+    if character['health'] > character['max_health']:
+        character['health'] = character['max_health']
+    if character['health'] < 1:
+        character['health'] = 1
+    return modifiers
+
+def get_base_stats(character):
+    """
+    Get the character's stats without any modifiers
+
+    Returns: Dictionary of stat name -> base value
+    """
+    base_stats = {stat_name: character[stat_name] for stat_name in VALID_EFFECT_STATS}
+    for modifiers in character.get('modifiers', {}).values():
+        for stat_name, value in modifiers:
+            base_stats[stat_name] -= value
+    return base_stats
 
 # ============================================================================
 # SHOP SYSTEM
 # ============================================================================
 
-def purchase_item(character, item_id, item_data):
+def purchase_item(character, item_id, item_data, item_data_dict=None):
     """
     Purchase an item from a shop
     
@@ -273,6 +602,8 @@ def purchase_item(character, item_id, item_data):
         character: Character dictionary
         item_id: Item to purchase
         item_data: Item information with 'cost' field
+        item_data_dict: All item data, for stack sizes (see
+                        get_slots_used), optional
     
     Returns: True if purchased successfully
     Raises:
@@ -287,10 +618,10 @@ def purchase_item(character, item_id, item_data):
     cost = item_data.get('cost', 0)
     if character['gold'] < cost:
         raise InsufficientResourcesError("Not enough gold to purchase item.")
-    if len(character['inventory']) >= MAX_INVENTORY_SIZE:
+    if not _has_room_for(character, item_id, item_data, item_data_dict):
         raise InventoryFullError("Inventory is full.")
     character['gold'] -= cost
-    character['inventory'].append(item_id)
+    _add_units(character['inventory'], item_id, 1, item_data)
     return True
 
 def sell_item(character, item_id, item_data):
@@ -318,6 +649,194 @@ def sell_item(character, item_id, item_data):
     else:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory.")
 
+def get_shop_items(item_data_dict, item_type=None, min_cost=None, max_cost=None):
+    """
+    List shop items, optionally filtered by type and price range
+
+    Args:
+        item_data_dict: Dictionary of all item data
+        item_type: Only include this type (weapon, armor, consumable)
+        min_cost, max_cost: Price bounds, or None for no limit
+
+    Uses the catalog's cost index when it has one (catalogs from
+    game_data.load_items), so the cost grows with the result size.
+
+    Returns: List of item data dictionaries sorted by cost
+    """
+    if hasattr(item_data_dict, 'items_in_price_range'):
+        return item_data_dict.items_in_price_range(min_cost, max_cost, item_type)
+    matching_items = []
+    for item in item_data_dict.values():
+        if item_type is not None and item['type'] != item_type:
+            continue
+        if min_cost is not None and item['cost'] < min_cost:
+            continue
+        if max_cost is not None and item['cost'] > max_cost:
+            continue
+        matching_items.append(item)
+    matching_items.sort(key=lambda item: item['cost'])
+    return matching_items
+
+# ============================================================================
+# SHOP TRANSACTIONS
+# ============================================================================
+
+def purchase_many(character, basket, item_data_dict):
+    """
+    Buy a basket of items all at once
+
+    Gold and inventory space are checked for the whole basket before
+    anything changes, and the basket is bought completely or not at all.
+
+    Args:
+        character: Character dictionary
+        basket: Dictionary of item_id -> quantity
+        item_data_dict: Dictionary of all item data
+
+    Returns: Receipt dictionary with 'items' (the basket), 'gold_spent'
+             and 'gold_remaining'
+    Raises:
+        ItemNotFoundError if an item isn't in item_data_dict
+        InsufficientResourcesError if the basket costs more than the gold
+        InventoryFullError if the basket doesn't fit
+        ValueError if a quantity isn't a positive integer
+    """
+    basket = _check_basket(basket)
+    total_cost = 0
+    for item_id, quantity in basket.items():
+        if item_id not in item_data_dict:
+            raise ItemNotFoundError(f"Item {item_id} is not sold here.")
+        total_cost += item_data_dict[item_id].get('cost', 0) * quantity
+    if character['gold'] < total_cost:
+        raise InsufficientResourcesError(
+            f"Basket costs {total_cost} gold, but only {character['gold']} available.")
+    inventory = character['inventory']
+    counts = item_counts(inventory)
+    for item_id, quantity in basket.items():
+        counts[item_id] = counts.get(item_id, 0) + quantity
+    if _count_slots(counts, lambda item_id: _stack_size(inventory, item_id, item_data_dict)) \
+            > MAX_INVENTORY_SIZE:
+        raise InventoryFullError("Not enough inventory space for the basket.")
+
+    with _rollback_on_error(character):
+        character['gold'] -= total_cost
+        for item_id, quantity in basket.items():
+            _add_units(character['inventory'], item_id, quantity, item_data_dict[item_id])
+    return {'items': basket, 'gold_spent': total_cost, 'gold_remaining': character['gold']}
+
+def sell_many(character, basket, item_data_dict):
+    """
+    Sell a basket of items all at once, each for half its cost
+
+    Args:
+        character: Character dictionary
+        basket: Dictionary of item_id -> quantity
+        item_data_dict: Dictionary of all item data
+
+    Returns: Receipt dictionary with 'items' (the basket), 'gold_earned'
+             and 'gold_remaining'
+    Raises:
+        ItemNotFoundError if the character has fewer of an item than
+        the basket, or the item has no item data
+        ValueError if a quantity isn't a positive integer
+    """
+    basket = _check_basket(basket)
+    _check_has_items(character, basket)
+    total_price = 0
+    for item_id, quantity in basket.items():
+        if item_id not in item_data_dict:
+            raise ItemNotFoundError(f"Item {item_id} can't be sold here.")
+        total_price += item_data_dict[item_id].get('cost', 0) // 2 * quantity
+
+    with _rollback_on_error(character):
+        for item_id, quantity in basket.items():
+            _remove_units(character['inventory'], item_id, quantity)
+        character['gold'] += total_price
+    return {'items': basket, 'gold_earned': total_price, 'gold_remaining': character['gold']}
+
+def transfer(source, target, basket, item_data_dict=None):
+    """
+    Move a basket of items from one character's inventory to another's
+
+    Args:
+        source: Character giving the items
+        target: Character receiving the items
+        basket: Dictionary of item_id -> quantity
+        item_data_dict: Item data for stack sizes (optional; stack sizes
+                        recorded in source's Inventory are used otherwise)
+
+    Returns: Receipt dictionary with 'items', 'from' and 'to' (names)
+    Raises:
+        ItemNotFoundError if source has fewer of an item than the basket
+        InventoryFullError if the basket doesn't fit in target's inventory
+        ValueError if a quantity isn't a positive integer
+    """
+    basket = _check_basket(basket)
+    _check_has_items(source, basket)
+    source_inventory = source['inventory']
+    target_inventory = target['inventory']
+    # The basket's stack sizes come with it from the source
+    stacks = {item_id: {'stack': _stack_size(source_inventory, item_id, item_data_dict)}
+              for item_id in basket}
+    counts = item_counts(target_inventory)
+    for item_id, quantity in basket.items():
+        counts[item_id] = counts.get(item_id, 0) + quantity
+
+    def stack_size(item_id):
+        return _stack_size(target_inventory, item_id, item_data_dict, stacks.get(item_id))
+    if _count_slots(counts, stack_size) > MAX_INVENTORY_SIZE:
+        raise InventoryFullError(f"Not enough inventory space for {target.get('name', 'target')}.")
+
+    with _rollback_on_error(source, target):
+        for item_id, quantity in basket.items():
+            _remove_units(source['inventory'], item_id, quantity)
+            _add_units(target['inventory'], item_id, quantity, stacks[item_id])
+    return {'items': basket, 'from': source.get('name'), 'to': target.get('name')}
+
+def _check_basket(basket):
+    """Copy a basket, checking that every quantity is a positive integer"""
+    basket = dict(basket)
+    for item_id, quantity in basket.items():
+        if not isinstance(quantity, int) or quantity < 1:
+            raise ValueError(f"Invalid quantity for {item_id}: {quantity}")
+    return basket
+
+def _check_has_items(character, basket):
+    inventory = character['inventory']
+    for item_id, quantity in basket.items():
+        if inventory.count(item_id) < quantity:
+            raise ItemNotFoundError(
+                f"Only {inventory.count(item_id)} of {item_id} in inventory, need {quantity}.")
+
+def _add_units(inventory, item_id, quantity, item_data=None):
+    """Add quantity of item_id, recording its stack size if item_data is given"""
+    if isinstance(inventory, Inventory):
+        stack = get_stack_limit(item_data) if item_data is not None else None
+        inventory.add(item_id, quantity, stack)
+    else:
+        inventory.extend([item_id] * quantity)
+
+def _remove_units(inventory, item_id, quantity):
+    if isinstance(inventory, Inventory):
+        inventory.remove(item_id, quantity)
+    else:
+        for _ in range(quantity):
+            inventory.remove(item_id)
+
+@contextmanager
+def _rollback_on_error(*characters):
+    """Restore the gold and inventories of characters if the block raises"""
+    saved = [(character, character.get('gold'), character['inventory'].copy())
+             for character in characters]
+    try:
+        yield
+    except BaseException:
+        for character, gold, inventory in saved:
+            if gold is not None:
+                character['gold'] = gold
+            character['inventory'] = inventory
+        raise
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -331,12 +850,39 @@ def parse_item_effect(effect_string):
     
     Returns: Tuple of (stat_name, value)
     Example: "health:20" → ("health", 20)
+    For multi-stat effects this is the first stat; use get_item_effect
+    or game_data.compile_item_effect for all of them.
+    Raises: ValueError if the string is empty, malformed or names a stat
+            outside game_data.VALID_EFFECT_STATS
+    """
+    try:
+        modifiers = compile_item_effect(effect_string).modifiers
+    except InvalidDataFormatError as e:
+        raise ValueError(str(e)) from e
+    if not modifiers:
+        raise ValueError(f"Empty effect string: '{effect_string}'")
+    return modifiers[0]
+
+def get_item_effect(item_data):
+    """
+    Get the compiled effect for an item
+
+    Items loaded by game_data carry their effect precompiled. Plain
+    item dictionaries are compiled on first use and shared after that.
+
+    Returns: game_data.ItemEffect
+    """
+    effect = getattr(item_data, 'compiled_effect', None)
+    if effect is None:
+        effect = compile_item_effect(item_data.get('effect', ''))
+    return effect
+
+def apply_item_effect(character, effect):
+    """
+    Apply every stat modifier of a compiled ItemEffect to character
     """
-    # TODO: Implement effect parsing
-    # Split on ":"
-    # Convert value to integer
-    effect_name, effect_value = effect_string.split(':')
-    return effect_name, int(effect_value)
+    for stat_name, value in effect.modifiers:
+        apply_stat_effect(character, stat_name, value)
 
 def apply_stat_effect(character, stat_name, value):
     """
@@ -367,9 +913,8 @@ def display_inventory(character, item_data_dict):
     # TODO: Implement inventory display
     # Count items (some may appear multiple times)
     # Display with item names from item_data_dict
-    for item in item_data_dict:
-        count = character['inventory'].count(item)
-        if count > 0:
+    for item, count in item_counts(character['inventory']).items():
+        if item in item_data_dict:
             item_name = item_data_dict[item].get('name', item)
             item_type = item_data_dict[item].get('type', 'unknown')
             print(f"{item_name} (Type: {item_type}) x{count}")
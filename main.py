@@ -28,6 +28,9 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# Autosaves after each action are written in the background
+save_queue = character_manager.SaveQueue()
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -119,13 +122,14 @@ def load_game():
     # Try to load character with character_manager.load_character()
     # Handle CharacterNotFoundError and SaveFileCorruptedError
     # Start game loop
-    saved_characters = character_manager.list_saved_characters()
+    summaries = character_manager.list_character_summaries()
+    saved_characters = [summary['name'] for summary in summaries]
     if not saved_characters:
         print("No saved characters found.")
         return
     print("\n=== SAVED CHARACTERS ===")
-    for idx, char_name in enumerate(saved_characters, start=1):
-        print(f"{idx}. {char_name}")
+    for idx, summary in enumerate(summaries, start=1):
+        print(f"{idx}. {summary['name']} - Level {summary['level']} {summary['class']}")
     choice = input("Enter the number of the character to load: ")
     correct_input = False
     while not correct_input:
@@ -172,6 +176,9 @@ def game_loop():
             game_running = False
         else:
             print("Invalid choice. Please select a valid option.")
+            continue
+        if game_running:
+            save_queue.submit(current_character)
 
 def game_menu():
     """
@@ -311,8 +318,8 @@ def shop():
     print("\n=== SHOP ===")
     print(f"Your Gold: {current_character['gold']}")
     print("Available Items:")
-    for item_id, item_data in all_items.items():
-        print(f"ID: {item_id} - {item_data['name']} - Cost: {item_data['cost']} Gold")
+    for item_data in inventory_system.get_shop_items(all_items):
+        print(f"ID: {item_data['item_id']} - {item_data['name']} - Cost: {item_data['cost']} Gold")
     print("Options:")
     print("1. Buy Item")
     print("2. Sell Item")
@@ -338,6 +345,8 @@ def save_game():
     # Use character_manager.save_character()
     # Handle any file I/O exceptions
     try:
+        # Let pending autosaves land first so they can't overwrite this one
+        save_queue.flush()
         character_manager.save_character(current_character)
         print("Game saved successfully.")
     except Exception as e:
@@ -352,8 +361,8 @@ def load_game_data():
     # Try to load items with game_data.load_items()
     # Handle MissingDataFileError, InvalidDataFormatError
     # If files missing, create defaults with game_data.create_default_data_files()
-    all_quests = game_data.load_quests()
-    all_items = game_data.load_items()
+    all_quests = game_data.load_quests(use_cache=True)
+    all_items = game_data.load_items(use_cache=True)
     character_manager.load_character(current_character)
 
 def handle_character_death():
@@ -151,11 +151,16 @@ def get_available_quests(character, quest_data_dict):
     
     Returns: List of quest dictionaries
     """
-    # TODO: Implement available quest search
     # Filter all quests by requirements
+    # Catalogs from game_data have a level index, so only quests at or
+    # below the character's level are looked at
+    if hasattr(quest_data_dict, 'quests_between_levels'):
+        candidates = [(quest['quest_id'], quest)
+                      for quest in quest_data_dict.quests_between_levels(None, character['level'])]
+    else:
+        candidates = quest_data_dict.items()
     available_quests = []
-    for qid in quest_data_dict:
-        quest = quest_data_dict[qid]
+    for qid, quest in candidates:
         if character['level'] >= quest['required_level']:
             prereq = quest['prerequisite']
             if prereq == "NONE" or prereq in character['completed_quests']:
@@ -281,9 +286,13 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     """
     Get all quests within a level range
     
+    Uses the catalog's level index when it has one (catalogs from
+    game_data.load_quests), so the cost grows with the result size.
+
     Returns: List of quest dictionaries
     """
-    # TODO: Implement level filtering
+    if hasattr(quest_data_dict, 'quests_between_levels'):
+        return quest_data_dict.quests_between_levels(min_level, max_level)
     filtered_quests = []
     for qid in quest_data_dict:
         quest = quest_data_dict[qid]
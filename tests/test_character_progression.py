@@ -0,0 +1,63 @@
+"""
+Test Character Progression
+Tests for closed-form levelling and batch experience grants
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+def level_up_by_loop(level, experience):
+    """Reference: level up one step at a time"""
+    levels = 0
+    while experience >= level * 100:
+        experience -= level * 100
+        level += 1
+        levels += 1
+    return levels, experience
+
+# ============================================================================
+# EXPERIENCE TESTS
+# ============================================================================
+
+def test_closed_form_matches_loop():
+    """Test that closed-form levelling matches one-level-at-a-time levelling"""
+    for level in [1, 2, 7, 50]:
+        for xp in [0, 99, 100, 299, 300, 5000, 123456]:
+            char = character_manager.create_character("Loop", "Warrior")
+            char['level'] = level
+
+            gained = character_manager.gain_experience(char, xp)
+
+            assert (gained, char['experience']) == level_up_by_loop(level, xp)
+            assert char['level'] == level + gained
+            assert char['strength'] == 15 + 2 * gained
+
+def test_huge_grant_levels_many_times():
+    """Test that a huge grant is applied without looping per level"""
+    char = character_manager.create_character("Admin", "Mage")
+
+    gained = character_manager.gain_experience(char, 10**15)
+
+    assert gained > 4_000_000
+    assert 0 <= char['experience'] < char['level'] * 100
+    assert char['health'] == char['max_health']
+
+def test_gain_experience_batch_is_all_or_nothing():
+    """Test batch grants and that one dead character blocks the batch"""
+    guild = [character_manager.create_character(f"Member{i}", "Cleric") for i in range(3)]
+
+    assert character_manager.gain_experience_batch(guild, [100, 300, 50]) == [1, 2, 0]
+
+    guild[2]['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        character_manager.gain_experience_batch(guild, 1000)
+    assert [char['level'] for char in guild] == [2, 3, 1]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
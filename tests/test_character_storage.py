@@ -0,0 +1,545 @@
+"""
+Test Character Storage
+Tests for saving, loading and listing characters
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_save_is_atomic_and_leaves_no_temp_files(tmp_path):
+    """Test that saving replaces the file and cleans up its temp file"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("AtomicTest", "Warrior")
+
+    character_manager.save_character(char, save_dir, fsync=True)
+    char['gold'] = 500
+    character_manager.save_character(char, save_dir)
+
+    assert os.listdir(save_dir) == ["AtomicTest_save.txt"]
+    assert character_manager.load_character("AtomicTest", save_dir)['gold'] == 500
+
+def test_failed_save_keeps_previous_file(tmp_path):
+    """Test that a save that fails part way leaves the old save intact"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("CrashTest", "Mage")
+    character_manager.save_character(char, save_dir)
+
+    broken = dict(char)
+    del broken['gold']
+    with pytest.raises(KeyError):
+        character_manager.save_character(broken, save_dir)
+
+    assert character_manager.load_character("CrashTest", save_dir)['gold'] == 100
+    assert os.listdir(save_dir) == ["CrashTest_save.txt"]
+
+def test_save_characters_batch(tmp_path):
+    """Test that save_characters writes every character in the batch"""
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Batch{i}", "Rogue") for i in range(5)]
+
+    saved = character_manager.save_characters(chars, save_dir)
+
+    assert saved == 5
+    assert sorted(character_manager.list_saved_characters(save_dir)) == [f"Batch{i}" for i in range(5)]
+
+# ============================================================================
+# SQLITE STORE TESTS
+# ============================================================================
+
+def test_sqlite_store_round_trip(tmp_path):
+    """Test save/load/list/delete on the SQLite store"""
+    store = character_manager.SqliteCharacterStore(str(tmp_path / "chars.db"))
+    char = character_manager.create_character("SqlHero", "Cleric")
+    char['inventory'] = ['health_potion', 'iron_sword']
+
+    store.save(char)
+    loaded = store.load("SqlHero")
+
+    assert loaded['inventory'] == ['health_potion', 'iron_sword']
+    assert store.list() == ["SqlHero"]
+    assert store.delete("SqlHero") == True
+    with pytest.raises(CharacterNotFoundError):
+        store.load("SqlHero")
+    store.close()
+
+def test_sqlite_transaction_rolls_back(tmp_path):
+    """Test that a failing batch leaves nothing behind"""
+    store = character_manager.SqliteCharacterStore(str(tmp_path / "chars.db"))
+    good = character_manager.create_character("Good", "Warrior")
+
+    with pytest.raises(KeyError):
+        with store.transaction():
+            store.save(good)
+            store.save({'name': 'Bad'})
+
+    assert store.list() == []
+    store.close()
+
+def test_sqlite_migrates_text_saves(tmp_path):
+    """Test the one-shot migration from text save files"""
+    save_dir = str(tmp_path / "saves")
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+    with open(os.path.join(save_dir, "Broken_save.txt"), "w") as f:
+        f.write("NAME : Broken\nLEVEL : high\n")
+    store = character_manager.SqliteCharacterStore(str(tmp_path / "chars.db"))
+
+    result = store.migrate_text_saves(save_dir)
+
+    assert result['migrated'] == 2
+    assert list(result['errors']) == ["Broken"]
+    assert store.list() == ["Ann", "Bob"]
+    store.close()
+
+# ============================================================================
+# STORAGE BACKEND TESTS
+# ============================================================================
+
+def test_memory_backend_routes_module_functions():
+    """Test that the module functions use the configured backend"""
+    store = character_manager.MemoryCharacterStore()
+    character_manager.set_storage_backend(store)
+    try:
+        character = character_manager.create_character("MemHero", "Rogue")
+        character_manager.save_character(character, "does/not/exist")
+        character['inventory'].append("health_potion")
+
+        loaded = character_manager.load_character("MemHero")
+        assert loaded['inventory'] == []
+        assert character_manager.list_saved_characters() == ["MemHero"]
+        assert character_manager.delete_character("MemHero") == True
+        assert not os.path.exists("does/not/exist")
+    finally:
+        character_manager.set_storage_backend(None)
+
+def test_character_store_requires_core_methods():
+    """Test that a backend missing save/load/list/delete can't be created"""
+    class PartialStore(character_manager.CharacterStore):
+        def save(self, character, fsync=False):
+            return True
+
+    with pytest.raises(TypeError):
+        character_manager.CharacterStore()
+    with pytest.raises(TypeError):
+        PartialStore()
+
+def test_single_file_store_survives_reopen_and_compacts(tmp_path):
+    """Test the append-only store's index rebuild, tombstones and compaction"""
+    path = str(tmp_path / "chars.store")
+    store = character_manager.SingleFileCharacterStore(path)
+    hero = character_manager.create_character("Hero", "Cleric")
+    for gold in range(5):
+        hero['gold'] = gold
+        store.save(hero)
+    store.save(character_manager.create_character("Gone", "Mage"))
+    store.delete("Gone")
+    store.close()
+
+    store = character_manager.SingleFileCharacterStore(path)
+    assert store.list() == ["Hero"]
+    assert store.load("Hero")['gold'] == 4
+    size = os.path.getsize(path)
+    store.compact()
+    assert os.path.getsize(path) < size
+    assert store.load("Hero")['gold'] == 4
+    with pytest.raises(CharacterNotFoundError):
+        store.delete("Gone")
+    store.close()
+
+def test_single_file_store_drops_torn_record(tmp_path):
+    """Test that a partially written record at the end is ignored"""
+    path = str(tmp_path / "chars.store")
+    store = character_manager.SingleFileCharacterStore(path)
+    store.save(character_manager.create_character("Hero", "Warrior"))
+    store.close()
+    with open(path, "ab") as f:
+        f.write(b"\x01\x05\x00")
+
+    store = character_manager.SingleFileCharacterStore(path)
+    assert store.list() == ["Hero"]
+    store.close()
+
+def test_single_file_store_fsyncs_batch_once(tmp_path, monkeypatch):
+    """Test that save_characters(fsync=True) syncs the single-file store once"""
+    store = character_manager.SingleFileCharacterStore(str(tmp_path / "chars.store"))
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    party = [character_manager.create_character(f"Hero{i}", "Rogue") for i in range(3)]
+
+    assert character_manager.save_characters(party, backend=store, fsync=True) == 3
+    assert len(synced) == 1
+    assert store.list() == ["Hero0", "Hero1", "Hero2"]
+    store.close()
+
+# ============================================================================
+# SAVE MANIFEST TESTS
+# ============================================================================
+
+def test_manifest_tracks_saves_and_deletes(tmp_path):
+    """Test that list_saved_characters reads the manifest journal"""
+    save_dir = str(tmp_path / "saves")
+    os.makedirs(save_dir)
+    store = character_manager.FileCharacterStore(save_dir)
+    assert store.list() == []
+    hero = character_manager.create_character("Hero", "Mage")
+    store.save(hero)
+    store.save(character_manager.create_character("Other", "Rogue"))
+    store.delete("Other")
+
+    summaries = character_manager.FileCharacterStore(save_dir).list_summaries()
+
+    assert [(s['name'], s['class'], s['level']) for s in summaries] == [("Hero", "Mage", 1)]
+    with open(store.manifest_path) as f:
+        kinds = [line.split("\t")[0] for line in f]
+    assert [kind for kind in kinds if kind != "V"] == ["S", "S", "D"]
+    assert kinds[-1] == "V"
+
+def test_manifest_rebuilt_when_missing_or_stale(tmp_path):
+    """Test the scandir rebuild after saves are added behind its back"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Ann", "Cleric"), save_dir)
+    store = character_manager.FileCharacterStore(save_dir)
+    assert store.list() == ["Ann"]
+
+    with open(os.path.join(save_dir, "Bob_save.txt"), "w") as f:
+        f.write("NAME : Bob\nCLASS : Warrior\nLEVEL : 3\n")
+    manifest_stat = os.stat(store.manifest_path)
+    os.utime(save_dir, ns=(manifest_stat.st_atime_ns, manifest_stat.st_mtime_ns + 10**9))
+
+    summaries = {s['name']: s for s in store.list_summaries()}
+    assert sorted(summaries) == ["Ann", "Bob"]
+    assert summaries['Bob']['level'] == 3
+
+def test_manifest_notices_save_added_during_rebuild(tmp_path):
+    """Test that a save written while the manifest is rebuilt is listed next time"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Ann", "Cleric"), save_dir)
+    store = character_manager.FileCharacterStore(save_dir)
+    scan = store._iter_save_entries
+
+    def scan_then_save():
+        yield from scan()
+        with open(os.path.join(save_dir, "Bob_save.txt"), "w") as f:
+            f.write("NAME : Bob\nCLASS : Warrior\nLEVEL : 3\n")
+    store._iter_save_entries = scan_then_save
+    assert store.list() == ["Ann"]
+
+    store._iter_save_entries = scan
+    assert sorted(store.list()) == ["Ann", "Bob"]
+    assert sorted(character_manager.FileCharacterStore(save_dir).list()) == ["Ann", "Bob"]
+
+def test_manifest_survives_unreadable_save(tmp_path):
+    """Test that an unreadable save doesn't break listing from a fresh store"""
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Ann", "Cleric"), save_dir)
+    with open(os.path.join(save_dir, "Broken_save.txt"), "wb") as f:
+        f.write(b"\x00garbage")
+    assert sorted(character_manager.FileCharacterStore(save_dir).list()) == ["Ann", "Broken"]
+
+    summaries = {s['name']: s for s in character_manager.FileCharacterStore(save_dir).list_summaries()}
+    assert summaries['Ann']['level'] == 1
+    assert summaries['Broken']['class'] is None and summaries['Broken']['level'] is None
+
+    # A malformed manifest (e.g. from an older version) is rebuilt, not fatal
+    with open(os.path.join(save_dir, ".manifest"), "a") as f:
+        f.write("S\tBroken\tNone\tNone\t1.0\n")
+    assert sorted(character_manager.FileCharacterStore(save_dir).list()) == ["Ann", "Broken"]
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+def test_unchanged_character_is_not_rewritten():
+    """Test that saving an unchanged character skips the write"""
+    store = character_manager.MemoryCharacterStore()
+    hero = character_manager.create_character("Idle", "Warrior")
+    character_manager.save_character(hero, backend=store)
+    store._saves["Idle"] = b"sentinel"
+
+    assert character_manager.save_character(hero, backend=store) == True
+    assert store._saves["Idle"] == b"sentinel"
+
+    hero['inventory'].append("health_potion")
+    assert character_manager.get_dirty_fields(hero, backend=store) == ['inventory']
+    character_manager.save_character(hero, backend=store)
+    assert store.load("Idle")['inventory'] == ["health_potion"]
+
+def test_dirty_tracking_memory_is_bounded(monkeypatch):
+    """Test that only PERSISTED_LIMIT characters are remembered, as digests"""
+    monkeypatch.setattr(character_manager, "PERSISTED_LIMIT", 2)
+    store = character_manager.MemoryCharacterStore()
+    heroes = [character_manager.create_character(name, "Mage") for name in ["Ann", "Bob", "Cid"]]
+    heroes[2]['inventory'] = ["sword", "potion"]
+    for hero in heroes:
+        character_manager.save_character(hero, backend=store)
+
+    assert list(store._persisted) == ["Bob", "Cid"]
+    assert all(isinstance(digests, bytes) for digests in store._persisted.values())
+    assert store.get_dirty_fields(heroes[0]) == list(character_manager.SAVED_FIELDS)
+    heroes[2]['inventory'] = ["potion", "sword"]
+    assert store.get_dirty_fields(heroes[2]) == []
+
+def test_loaded_character_starts_clean(tmp_path):
+    """Test that loads, force and deleted files interact with dirty tracking"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("Ann", "Mage"), save_dir)
+    loaded = character_manager.load_character("Ann", save_dir)
+
+    assert character_manager.get_dirty_fields(loaded, save_dir) == []
+    assert character_manager.save_characters([loaded], save_dir) == 0
+    assert character_manager.save_characters([loaded], save_dir, force=True) == 1
+
+    os.remove(os.path.join(save_dir, "Ann_save.txt"))
+    character_manager.save_character(loaded, save_dir)
+    assert character_manager.load_character("Ann", save_dir)['class'] == "Mage"
+
+# ============================================================================
+# SAVE QUEUE TESTS
+# ============================================================================
+
+def test_save_queue_coalesces_and_flushes():
+    """Test that queued saves of one character write its latest state"""
+    store = character_manager.MemoryCharacterStore()
+    queue = character_manager.SaveQueue(backend=store)
+    hero = character_manager.create_character("Queued", "Rogue")
+
+    for gold in range(50):
+        hero['gold'] = gold
+        queue.submit(hero)
+    hero['gold'] = 999
+    assert queue.flush(timeout=5) == True
+
+    metrics = queue.metrics()
+    assert store.load("Queued")['gold'] == 49
+    assert metrics['queue_depth'] == 0
+    assert metrics['submitted'] == 50
+    assert metrics['written'] + metrics['coalesced'] >= 50
+    assert metrics['write_latency_max'] >= 0
+    queue.close()
+    with pytest.raises(RuntimeError):
+        queue.submit(hero)
+
+def test_save_queue_records_errors():
+    """Test that a failing save is reported instead of killing the writer"""
+    store = character_manager.MemoryCharacterStore()
+    queue = character_manager.SaveQueue(backend=store)
+
+    queue.submit({'name': 'Broken'})
+    queue.submit(character_manager.create_character("Fine", "Mage"))
+    queue.close()
+
+    assert isinstance(queue.errors['Broken'], KeyError)
+    assert store.list() == ["Fine"]
+    assert queue.metrics()['failed'] == 1
+
+# ============================================================================
+# BULK LOAD AND CACHE TESTS
+# ============================================================================
+
+def test_load_characters_reports_errors(tmp_path):
+    """Test that bulk loading returns characters and per-name errors"""
+    save_dir = str(tmp_path)
+    for name in ["Ann", "Bob", "Cid"]:
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+    with open(os.path.join(save_dir, "Bad_save.txt"), "w") as f:
+        f.write("NAME : Bad\nLEVEL : high\n")
+
+    result = character_manager.load_characters(["Cid", "Bad", "Ann", "Nobody"], save_dir, workers=4)
+
+    assert list(result['characters']) == ["Cid", "Ann"]
+    assert sorted(result['errors']) == ["Bad", "Nobody"]
+
+def test_character_cache_hits_and_invalidation():
+    """Test that cached loads skip the backend and saves invalidate them"""
+    store = character_manager.MemoryCharacterStore()
+    character_manager.enable_character_cache(max_size=1)
+    try:
+        hero = character_manager.create_character("Hot", "Warrior")
+        character_manager.save_character(hero, backend=store)
+        first = character_manager.load_character("Hot", backend=store)
+        store._saves["Hot"] = b"not a save"
+
+        second = character_manager.load_character("Hot", backend=store)
+        assert second == first and second is not first
+        second['inventory'].append("iron_sword")
+        assert character_manager.load_character("Hot", backend=store)['inventory'] == []
+
+        hero['gold'] = 7
+        character_manager.save_character(hero, backend=store)
+        assert character_manager.load_character("Hot", backend=store)['gold'] == 7
+    finally:
+        character_manager.disable_character_cache()
+
+def test_character_cache_skips_load_that_overlaps_save():
+    """Test that a load reading the old save while it is replaced isn't cached"""
+    class PausedStore(character_manager.MemoryCharacterStore):
+        def load(self, character_name):
+            character = super().load(character_name)
+            read_old_save.set()
+            resume.wait(5)
+            return character
+
+    store = PausedStore()
+    read_old_save = threading.Event()
+    resume = threading.Event()
+    character_manager.enable_character_cache()
+    try:
+        hero = character_manager.create_character("Racer", "Mage")
+        character_manager.save_character(hero, backend=store)
+        loader = threading.Thread(target=character_manager.load_character,
+                                  args=("Racer",), kwargs={'backend': store})
+        loader.start()
+        assert read_old_save.wait(5)
+
+        hero['gold'] = 99
+        character_manager.save_character(hero, backend=store)
+        resume.set()
+        loader.join(5)
+
+        assert character_manager.load_character("Racer", backend=store)['gold'] == 99
+    finally:
+        resume.set()
+        character_manager.disable_character_cache()
+
+# ============================================================================
+# BINARY SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_format_round_trips():
+    """Test that binary saves load back identically and are detected"""
+    hero = character_manager.create_character("Bin", "Cleric")
+    hero['inventory'] = ["health_potion", "health_potion", "iron_sword"]
+    hero['completed_quests'] = ["first_steps"]
+
+    data = character_manager.serialize_character(hero, "binary")
+
+    assert data.startswith(character_manager.BINARY_SAVE_MAGIC)
+    assert character_manager.deserialize_character(data) == character_manager.deserialize_character(
+        character_manager.serialize_character(hero))
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.deserialize_character(data[:-3])
+
+def test_convert_saves_upgrades_text_saves(tmp_path):
+    """Test the bulk converter and loading mixed-format directories"""
+    save_dir = str(tmp_path)
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Rogue"), save_dir)
+
+    result = character_manager.convert_saves(save_dir, "binary")
+
+    assert result == {'converted': 2, 'errors': {}}
+    with open(os.path.join(save_dir, "Ann_save.txt"), "rb") as f:
+        assert f.read(4) == character_manager.BINARY_SAVE_MAGIC
+    assert character_manager.load_character("Bob", save_dir)['class'] == "Rogue"
+    os.remove(os.path.join(save_dir, ".manifest"))
+    summaries = character_manager.FileCharacterStore(save_dir).list_summaries()
+    assert {s['name']: s['level'] for s in summaries} == {"Ann": 1, "Bob": 1}
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_sharded_store_round_trip(tmp_path):
+    """Test save, list, load and delete with the sharded layout"""
+    save_dir = str(tmp_path)
+    store = character_manager.FileCharacterStore(save_dir, sharded=True)
+    store.save(character_manager.create_character("Shard", "Mage"))
+
+    path = store._sharded_path("Shard")
+    assert os.path.exists(path)
+    assert os.path.relpath(path, save_dir).count(os.sep) == 2
+    assert store.list() == ["Shard"]
+    assert store.load("Shard")['class'] == "Mage"
+    assert store.delete("Shard") == True
+    assert store.list() == []
+
+def test_sharded_manifest_notices_save_removed_by_hand(tmp_path):
+    """Test that removing a sharded save outside the store updates the listing"""
+    save_dir = str(tmp_path)
+    store = character_manager.FileCharacterStore(save_dir, sharded=True)
+    for name in ["Ann", "Bob"]:
+        store.save(character_manager.create_character(name, "Mage"))
+    assert sorted(store.list()) == ["Ann", "Bob"]
+
+    os.remove(store._sharded_path("Bob"))
+
+    assert store.list() == ["Ann"]
+    assert character_manager.FileCharacterStore(save_dir, sharded=True).list() == ["Ann"]
+
+def test_migrate_to_sharded_layout(tmp_path):
+    """Test that flat saves move into shards and stay loadable"""
+    save_dir = str(tmp_path)
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Rogue"), save_dir)
+
+    assert character_manager.migrate_to_sharded_layout(save_dir) == 2
+
+    assert not any(name.endswith("_save.txt") for name in os.listdir(save_dir))
+    store = character_manager.FileCharacterStore(save_dir)
+    assert store.sharded
+    assert sorted(store.list()) == ["Ann", "Bob"]
+    assert character_manager.load_character("Ann", save_dir)['class'] == "Rogue"
+    assert character_manager.migrate_to_sharded_layout(save_dir) == 0
+
+def test_sharded_store_reads_unmigrated_saves(tmp_path):
+    """Test that flat saves are found and replaced during a migration"""
+    save_dir = str(tmp_path)
+    character_manager.FileCharacterStore(save_dir).save(
+        character_manager.create_character("Old", "Warrior"))
+    store = character_manager.FileCharacterStore(save_dir, sharded=True)
+
+    old = store.load("Old")
+    old['gold'] = 1
+    store.save(old)
+
+    assert not os.path.exists(os.path.join(save_dir, "Old_save.txt"))
+    assert store.load("Old")['gold'] == 1
+
+# ============================================================================
+# PEEK TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_peek_reads_only_the_header(tmp_path, save_format):
+    """Test that peek_character ignores everything after the summary fields"""
+    save_dir = str(tmp_path)
+    store = character_manager.FileCharacterStore(save_dir, save_format=save_format)
+    hero = character_manager.create_character("Peek", "Cleric")
+    hero['gold'] = 321
+    hero['inventory'] = ["health_potion"] * 500
+    store.save(hero)
+    with open(store._path("Peek"), "r+b") as f:
+        f.seek(-20, os.SEEK_END)
+        f.write(b"\xff" * 20)
+
+    summary = character_manager.peek_character("Peek", backend=store)
+
+    assert summary == {'name': "Peek", 'class': "Cleric", 'level': 1, 'gold': 321}
+    with pytest.raises(SaveFileCorruptedError):
+        store.load("Peek")
+
+def test_peek_on_other_backends(tmp_path):
+    """Test peek on the memory and SQLite backends"""
+    hero = character_manager.create_character("Peek", "Rogue")
+    memory = character_manager.MemoryCharacterStore(save_format="binary")
+    sqlite_store = character_manager.SqliteCharacterStore(str(tmp_path / "chars.db"))
+    for store in (memory, sqlite_store):
+        store.save(hero)
+        assert store.peek("Peek") == {'name': "Peek", 'class': "Rogue", 'level': 1, 'gold': 100}
+        with pytest.raises(CharacterNotFoundError):
+            store.peek("Nobody")
+    sqlite_store.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
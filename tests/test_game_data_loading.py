@@ -0,0 +1,337 @@
+"""
+Test Game Data Loading
+Tests for the streaming, cached and indexed catalog loaders
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_TEXT = """QUEST_ID: first_steps
+TITLE: First Steps
+DESCRIPTION: Begin your adventure
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: goblin_hunter
+TITLE: Goblin Hunter
+DESCRIPTION: Defeat 3 goblins
+REWARD_XP: 100
+REWARD_GOLD: 75
+REQUIRED_LEVEL: 2
+PREREQUISITE: first_steps
+"""
+
+ITEM_TEXT = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+def write_file(path, text):
+    """Write text to path and return it as a string"""
+    path.write_text(text)
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_records_in_order(tmp_path):
+    """Test that iter_quests streams validated quests in file order"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    quest_ids = [quest['quest_id'] for quest in game_data.iter_quests(filename)]
+
+    assert quest_ids == ['first_steps', 'goblin_hunter']
+
+def test_iter_items_matches_load_items(tmp_path):
+    """Test that load_items is built on the streaming reader"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+
+    streamed = {item['item_id']: item for item in game_data.iter_items(filename)}
+    loaded = game_data.load_items(filename)
+
+    assert list(streamed) == list(loaded)
+    assert loaded['iron_sword']['cost'] == 100
+
+def test_iter_quests_reports_line_number(tmp_path):
+    """Test that format errors name the file and starting line of the block"""
+    bad_text = QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: lots")
+    filename = write_file(tmp_path / "quests.txt", bad_text)
+
+    with pytest.raises(InvalidDataFormatError) as error:
+        game_data.load_quests(filename)
+
+    assert "line 9" in str(error.value)
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_records_support_dict_access(tmp_path):
+    """Test that compact records behave like the old data dictionaries"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    item = game_data.load_items(filename)['iron_sword']
+
+    assert isinstance(item, game_data.ItemRecord)
+    assert item['cost'] == 100
+    assert item.get('missing', 'default') == 'default'
+    assert 'type' in item and 'missing' not in item
+    assert dict(item)['name'] == 'Iron Sword'
+    assert not hasattr(item, '__dict__')
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cached_load_matches_parsed_load(tmp_path):
+    """Test that the compiled snapshot round-trips the catalog"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    first = game_data.load_quests(filename, use_cache=True)
+    second = game_data.load_quests(filename, use_cache=True)
+
+    assert os.path.exists(filename + game_data.CACHE_SUFFIX)
+    assert first == second == game_data.load_quests(filename)
+
+def test_cached_items_reuse_stored_effects(tmp_path, monkeypatch):
+    """Test that a snapshot hit rebuilds item effects without parsing them"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    parsed = game_data.load_items(filename, use_cache=True)
+    game_data._compiled_effects.clear()
+
+    def fail(effect_string):
+        raise AssertionError(f"re-parsed effect {effect_string!r}")
+    monkeypatch.setattr(game_data, "compile_item_effect", fail)
+    cached = game_data.load_items(filename, use_cache=True)
+
+    assert cached['iron_sword'].compiled_effect.modifiers == (('strength', 5),)
+    assert cached == parsed
+
+def test_cache_rebuilds_when_source_changes(tmp_path):
+    """Test that a stale snapshot is rebuilt from the source file"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    game_data.load_items(filename, use_cache=True)
+
+    write_file(tmp_path / "items.txt", ITEM_TEXT.replace("COST: 100", "COST: 1000"))
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    items = game_data.load_items(filename, use_cache=True)
+    assert items['iron_sword']['cost'] == 1000
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_load_items(tmp_path):
+    """Test that LazyCatalog supports the same lookups as a loaded dict"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    loaded = game_data.load_items(filename)
+
+    with game_data.LazyCatalog(filename, kind="item") as catalog:
+        assert len(catalog) == len(loaded)
+        assert list(catalog) == list(loaded)
+        assert 'iron_sword' in catalog
+        assert 'missing_item' not in catalog
+        assert catalog['iron_sword'] == loaded['iron_sword']
+        assert catalog.get('missing_item') is None
+
+def test_lazy_catalog_cache_is_bounded(tmp_path):
+    """Test that only cache_size decoded records are kept"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    with game_data.LazyCatalog(filename, kind="quest", cache_size=1) as catalog:
+        catalog['first_steps']
+        catalog['goblin_hunter']
+        assert list(catalog._cache) == ['goblin_hunter']
+        assert catalog['first_steps']['reward_xp'] == 50
+
+# ============================================================================
+# SHARDED DIRECTORY TESTS
+# ============================================================================
+
+def test_load_catalog_dir_merges_shards(tmp_path):
+    """Test that shards are loaded in parallel and merged"""
+    quest_blocks = QUEST_TEXT.split("\n\n")
+    write_file(tmp_path / "north.txt", quest_blocks[0])
+    write_file(tmp_path / "south.txt", quest_blocks[1])
+
+    quests = game_data.load_catalog_dir(str(tmp_path), kind="quest", workers=2)
+
+    assert list(quests) == ['first_steps', 'goblin_hunter']
+
+def test_load_catalog_dir_rejects_duplicate_ids(tmp_path):
+    """Test that an id defined in two shards names both shards"""
+    write_file(tmp_path / "east.txt", ITEM_TEXT)
+    write_file(tmp_path / "west.txt", ITEM_TEXT)
+
+    with pytest.raises(InvalidDataFormatError) as error:
+        game_data.load_catalog_dir(str(tmp_path), kind="item", workers=1)
+
+    assert "east.txt" in str(error.value)
+    assert "west.txt" in str(error.value)
+
+def test_load_catalog_dir_reports_shard_and_line(tmp_path):
+    """Test that worker errors say which shard and line failed"""
+    write_file(tmp_path / "good.txt", ITEM_TEXT)
+    write_file(tmp_path / "bad.txt", "ITEM_ID: broken\nCOST: free\n")
+
+    with pytest.raises(InvalidDataFormatError) as error:
+        game_data.load_catalog_dir(str(tmp_path), kind="item", workers=2)
+
+    assert "bad.txt, line 1" in str(error.value)
+
+# ============================================================================
+# SECONDARY INDEX TESTS
+# ============================================================================
+
+def test_quest_level_index_matches_scan():
+    """Test that level range queries match a full scan"""
+    quests = game_data.load_quests("data/quests.txt")
+
+    for low, high in [(1, 1), (2, 3), (4, 5), (1, 10)]:
+        expected = {qid for qid, quest in quests.items()
+                    if low <= quest['required_level'] <= high}
+        result = quests.quests_between_levels(low, high)
+        assert {quest['quest_id'] for quest in result} == expected
+
+def test_quest_index_rebuilt_after_change(tmp_path):
+    """Test that changing the catalog invalidates its indexes"""
+    quests = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+    assert len(quests.quests_between_levels(2, 2)) == 1
+
+    del quests['goblin_hunter']
+
+    assert quests.quests_between_levels(2, 2) == []
+
+def test_item_index_rebuilt_after_merge():
+    """Test that |= invalidates indexes and records can't be edited in place"""
+    items = game_data.load_items("data/items.txt")
+    assert items.items_in_price_range(0, 10, item_type='weapon') == []
+
+    items |= {'stick': game_data.ItemRecord('stick', 'Stick', 'weapon', 'strength:1', 5, 'A stick')}
+
+    assert [item['item_id'] for item in items.items_in_price_range(0, 10, item_type='weapon')] == ['stick']
+    with pytest.raises(TypeError):
+        items['stick']['cost'] = 500
+
+# ============================================================================
+# COLUMNAR VIEW TESTS
+# ============================================================================
+
+def test_to_columns_rows_align_with_ids():
+    """Test that column rows stay aligned with the id list"""
+    pytest.importorskip("numpy")
+    quests = game_data.load_quests("data/quests.txt")
+
+    columns = game_data.to_columns(quests)
+
+    for row, quest_id in enumerate(columns['ids']):
+        quest = quests[quest_id]
+        assert columns['reward_xp'][row] == quest['reward_xp']
+        assert columns['required_level'][row] == quest['required_level']
+        code = columns['prerequisite'][row]
+        assert columns['prerequisite_categories'][code] == quest['prerequisite']
+
+def test_to_columns_item_effects():
+    """Test that item columns expose type codes and effect bonuses"""
+    pytest.importorskip("numpy")
+    items = game_data.load_items("data/items.txt")
+
+    columns = game_data.to_columns(items)
+    row = columns['ids'].index('iron_sword')
+
+    assert columns['type_categories'][columns['type'][row]] == 'weapon'
+    assert columns['effect_strength'][row] == 5
+    assert columns['cost'].sum() == sum(item['cost'] for item in items.values())
+
+# ============================================================================
+# BENCHMARK GENERATOR TESTS
+# ============================================================================
+
+def test_generated_catalogs_load(tmp_path):
+    """Test that the benchmark's synthetic catalogs are valid data files"""
+    from benchmarks import bench_loaders
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+
+    bench_loaders.generate_quest_file(quest_file, 200)
+    bench_loaders.generate_item_file(item_file, 200)
+    quests = game_data.load_quests(quest_file)
+
+    assert len(quests) == 200
+    assert len(game_data.load_items(item_file)) == 200
+    for quest in quests.values():
+        prereq = quest['prerequisite']
+        assert prereq == "NONE" or quests[prereq]['required_level'] <= quest['required_level']
+
+def test_cache_benchmark_checks_min_ratio(tmp_path):
+    """Test that the cache benchmark fails when a speedup is below --min-ratio"""
+    from benchmarks import bench_catalog_cache
+    args = ['--sizes', '50', '--repeat', '1', '--data-dir', str(tmp_path),
+            '--output', str(tmp_path / "report.json")]
+
+    assert bench_catalog_cache.main(args + ['--min-ratio', '0']) == 0
+    assert bench_catalog_cache.main(args + ['--min-ratio', '1e9']) == 1
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_catalog_watcher_applies_block_diff(tmp_path):
+    """Test that only changed blocks are re-parsed and the diff is applied"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    watcher = game_data.CatalogWatcher(filename, kind="item")
+    old_catalog = watcher.catalog
+    potion = old_catalog['health_potion']
+
+    new_text = ITEM_TEXT.replace("COST: 100", "COST: 120") + """
+ITEM_ID: magic_robe
+NAME: Magic Robe
+TYPE: armor
+EFFECT: magic:5
+COST: 150
+DESCRIPTION: Enchanted robes
+"""
+    write_file(tmp_path / "items.txt", new_text)
+    diff = watcher.poll()
+
+    assert diff == {'added': ['magic_robe'], 'removed': [], 'changed': ['iron_sword']}
+    assert watcher.catalog['iron_sword']['cost'] == 120
+    assert watcher.catalog['health_potion'] is potion
+    assert old_catalog['iron_sword']['cost'] == 100
+    assert watcher.poll() is None
+
+def test_catalog_watcher_keeps_catalog_on_bad_edit(tmp_path):
+    """Test that a broken edit raises and leaves the live catalog alone"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+    watcher = game_data.CatalogWatcher(filename, kind="quest")
+
+    write_file(tmp_path / "quests.txt", QUEST_TEXT.split("\n\n")[1])
+    assert watcher.poll()['removed'] == ['first_steps']
+
+    write_file(tmp_path / "quests.txt", "QUEST_ID: broken\nREWARD_XP: lots\n")
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert list(watcher.catalog) == ['goblin_hunter']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
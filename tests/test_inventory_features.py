@@ -0,0 +1,363 @@
+"""
+Test Inventory Features
+Tests for compiled item effects, shop queries and inventory storage
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+import game_data
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_multi_stat_effect_applies_every_stat():
+    """Test that a compiled multi-stat effect is applied in one use"""
+    char = character_manager.create_character("EffectTest", "Mage")
+    original_strength = char['strength']
+    original_magic = char['magic']
+    char['inventory'].append("elixir")
+    item_data = {'type': 'consumable', 'effect': 'strength:5,magic:3'}
+
+    inventory_system.use_item(char, "elixir", item_data)
+
+    assert char['strength'] == original_strength + 5
+    assert char['magic'] == original_magic + 3
+
+def test_unknown_effect_stat_rejected_at_load():
+    """Test that items with unknown effect stats fail validation"""
+    item = {
+        'item_id': 'odd_ring', 'name': 'Odd Ring', 'type': 'armor',
+        'effect': 'luck:5', 'cost': 10, 'description': 'Test'
+    }
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data(item)
+
+def test_parse_item_effect_raises_value_error():
+    """Test that bad effect strings still raise ValueError"""
+    assert inventory_system.parse_item_effect("health:20") == ("health", 20)
+    for effect_string in ["", "health", "health:lots"]:
+        with pytest.raises(ValueError):
+            inventory_system.parse_item_effect(effect_string)
+
+def test_loaded_items_carry_compiled_effects():
+    """Test that load_items precompiles each EFFECT"""
+    items = game_data.load_items("data/items.txt")
+
+    assert items['iron_sword'].compiled_effect.modifiers == (('strength', 5),)
+
+# ============================================================================
+# SHOP QUERY TESTS
+# ============================================================================
+
+def test_shop_query_by_type_and_price():
+    """Test that shop queries filter by type and cost using the index"""
+    items = game_data.load_items("data/items.txt")
+
+    weapons = inventory_system.get_shop_items(items, item_type='weapon', max_cost=200)
+    cheap = inventory_system.get_shop_items(items, max_cost=50)
+
+    assert [item['item_id'] for item in weapons] == ['iron_sword', 'fire_staff']
+    assert [item['cost'] for item in cheap] == [25, 50, 50]
+
+def test_shop_query_on_plain_dict():
+    """Test that shop queries still work on plain item dictionaries"""
+    items = {
+        'a': {'item_id': 'a', 'type': 'armor', 'cost': 30},
+        'b': {'item_id': 'b', 'type': 'armor', 'cost': 10},
+    }
+
+    result = inventory_system.get_shop_items(items, item_type='armor')
+
+    assert [item['item_id'] for item in result] == ['b', 'a']
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_behaves_like_a_list():
+    """Test the list operations the game uses on an Inventory"""
+    inventory = inventory_system.Inventory(["health_potion", "iron_sword", "health_potion"])
+
+    assert len(inventory) == 3
+    assert inventory.count("health_potion") == 2
+    assert "iron_sword" in inventory and "magic_robe" not in inventory
+    assert list(inventory) == ["health_potion", "health_potion", "iron_sword"]
+    assert inventory == ["iron_sword", "health_potion", "health_potion"]
+
+    inventory.remove("health_potion")
+    inventory.remove("iron_sword")
+    assert inventory == ["health_potion"]
+    with pytest.raises(ValueError):
+        inventory.remove("iron_sword")
+
+def test_inventory_rejects_non_positive_quantities():
+    """Test that add and remove both refuse quantities below 1"""
+    inventory = inventory_system.Inventory(["health_potion"] * 3)
+
+    for quantity in (0, -3):
+        with pytest.raises(ValueError):
+            inventory.remove("health_potion", quantity)
+        with pytest.raises(ValueError):
+            inventory.add("health_potion", quantity)
+    with pytest.raises(ValueError):
+        inventory.remove("missing_item", 0)
+    assert inventory.count("health_potion") == 3 and len(inventory) == 3
+
+def test_inventory_extend_index_and_concatenate():
+    """Test extend, indexing, slicing and + on an Inventory"""
+    inventory = inventory_system.Inventory(["iron_sword"])
+    inventory.extend(["health_potion", "iron_sword"])
+    inventory += ["leather_armor"]
+
+    assert list(inventory) == ["iron_sword", "iron_sword", "health_potion", "leather_armor"]
+    assert inventory[0] == "iron_sword" and inventory[-1] == "leather_armor"
+    assert inventory[1:3] == ["iron_sword", "health_potion"]
+    with pytest.raises(IndexError):
+        inventory[4]
+    assert (inventory + ["magic_robe"]).count("magic_robe") == 1
+    assert "magic_robe" not in inventory
+    assert ["magic_robe"] + inventory == ["magic_robe"] + list(inventory)
+
+def test_new_characters_use_inventory_and_round_trip(tmp_path):
+    """Test that characters get an Inventory and saves keep its contents"""
+    char = character_manager.create_character("Counter", "Warrior")
+    assert isinstance(char['inventory'], inventory_system.Inventory)
+
+    for item_id in ["health_potion", "iron_sword", "health_potion"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    inventory_system.sell_item(char, "iron_sword", {'cost': 100})
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Counter", str(tmp_path))
+
+    assert isinstance(loaded['inventory'], inventory_system.Inventory)
+    assert inventory_system.count_item(loaded, "health_potion") == 2
+    assert inventory_system.clear_inventory(loaded) == ["health_potion", "health_potion"]
+    assert len(loaded['inventory']) == 0
+
+# ============================================================================
+# STACKING TESTS
+# ============================================================================
+
+def test_items_stack_into_slots():
+    """Test that stackable items share slots and capacity counts slots"""
+    char = character_manager.create_character("Stacker", "Rogue")
+    char['gold'] = 10000
+    potion = {'type': 'consumable', 'effect': 'health:20', 'cost': 1, 'stack': 10}
+    items = {'health_potion': potion}
+    for _ in range(25):
+        inventory_system.purchase_item(char, "health_potion", potion, items)
+    assert inventory_system.get_slots_used(char, items) == 3
+    for index in range(inventory_system.MAX_INVENTORY_SIZE - 3):
+        inventory_system.add_item_to_inventory(char, f"sword_{index}", item_data_dict=items)
+
+    # The third potion stack has room; a new item does not
+    inventory_system.purchase_item(char, "health_potion", potion, items)
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "one_more_sword", item_data_dict=items)
+    assert inventory_system.get_inventory_space_remaining(char, items) == 0
+
+def test_stack_size_read_from_item_data_alone():
+    """Test that the item's own data is enough to stack it"""
+    char = character_manager.create_character("Hoarder", "Rogue")
+    char['gold'] = 10000
+    potion = {'type': 'consumable', 'effect': 'health:20', 'cost': 1, 'stack': 10}
+
+    for _ in range(inventory_system.MAX_INVENTORY_SIZE * 5):
+        inventory_system.purchase_item(char, "health_potion", potion)
+
+    assert inventory_system.get_slots_used(char, {'health_potion': potion}) == 10
+    # The Inventory remembers the stack size, so item data isn't needed
+    assert inventory_system.get_slots_used(char) == 10
+
+def test_slots_counted_without_item_data_after_basket():
+    """Test that stacks bought in a basket count as slots on every later path"""
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("Basket", "Warrior")
+    char['gold'] = 10000
+    inventory_system.add_item_to_inventory(char, "iron_sword", items['iron_sword'])
+    inventory_system.equip_weapon(char, "iron_sword", items['iron_sword'])
+
+    inventory_system.purchase_many(char, {'health_potion': 25}, items)
+
+    assert inventory_system.get_inventory_space_remaining(char) == 17
+    assert inventory_system.unequip_weapon(char) == "iron_sword"
+    assert inventory_system.add_item_to_inventory(char, "leather_armor", items['leather_armor'])
+    assert inventory_system.get_slots_used(char) == 5
+
+    other = character_manager.create_character("Receiver", "Mage")
+    inventory_system.transfer(char, other, {'health_potion': 25})
+    loaded = character_manager.deserialize_character(character_manager.serialize_character(other))
+    assert inventory_system.get_slots_used(loaded) == 3
+
+def test_stacks_saved_as_quantities(tmp_path):
+    """Test that saves store one entry per stack and still load old saves"""
+    char = character_manager.create_character("Saver", "Mage")
+    char['inventory'].add("health_potion", 12)
+    char['inventory'].append("iron_sword")
+
+    data = character_manager.serialize_character(char)
+    assert b"INVENTORY : health_potion*12,iron_sword\n" in data
+    for save_format in character_manager.SAVE_FORMATS:
+        loaded = character_manager.deserialize_character(
+            character_manager.serialize_character(char, save_format))
+        assert loaded['inventory'].count("health_potion") == 12
+
+    old_save = data.replace(b"health_potion*12", b"health_potion,health_potion")
+    loaded = character_manager.deserialize_character(old_save)
+    assert loaded['inventory'].count("health_potion") == 2
+
+def test_item_stack_field_loaded():
+    """Test the optional STACK field in items.txt"""
+    items = game_data.load_items("data/items.txt")
+
+    assert items['health_potion']['stack'] == 10
+    assert items['iron_sword']['stack'] == 1
+
+# ============================================================================
+# SHOP TRANSACTION TESTS
+# ============================================================================
+
+def test_purchase_many_and_sell_many_receipts():
+    """Test that baskets are bought and sold in one call with receipts"""
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("Buyer", "Warrior")
+    char['gold'] = 1000
+
+    receipt = inventory_system.purchase_many(char, {'health_potion': 20, 'iron_sword': 1}, items)
+
+    assert receipt == {'items': {'health_potion': 20, 'iron_sword': 1},
+                       'gold_spent': 600, 'gold_remaining': 400}
+    assert inventory_system.count_item(char, "health_potion") == 20
+
+    receipt = inventory_system.sell_many(char, {'health_potion': 10}, items)
+    assert receipt['gold_earned'] == 120
+    assert char['gold'] == 520
+    assert inventory_system.count_item(char, "health_potion") == 10
+
+def test_failed_basket_changes_nothing():
+    """Test that a basket that can't be afforded or held is rejected whole"""
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("Broke", "Mage")
+    char['inventory'].add("health_potion", 3)
+
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_many(char, {'health_potion': 2, 'steel_sword': 1}, items)
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_many(char, {'iron_sword': 21}, {'iron_sword': {'cost': 0}})
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.sell_many(char, {'health_potion': 2, 'iron_sword': 1}, items)
+
+    assert char['gold'] == 100
+    assert char['inventory'] == ["health_potion"] * 3
+
+def test_transfer_between_characters():
+    """Test moving items between two characters' inventories"""
+    giver = character_manager.create_character("Giver", "Cleric")
+    taker = character_manager.create_character("Taker", "Rogue")
+    giver['inventory'].add("health_potion", 5)
+
+    receipt = inventory_system.transfer(giver, taker, {'health_potion': 4})
+
+    assert receipt == {'items': {'health_potion': 4}, 'from': "Giver", 'to': "Taker"}
+    assert giver['inventory'].count("health_potion") == 1
+    assert taker['inventory'].count("health_potion") == 4
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.transfer(giver, taker, {'health_potion': 2})
+
+# ============================================================================
+# MODIFIER STACK TESTS
+# ============================================================================
+
+def test_unequip_removes_exact_bonus():
+    """Test that swapping and unequipping gear restores the base stats"""
+    char = character_manager.create_character("Gear", "Warrior")
+    base = inventory_system.get_base_stats(char)
+    for item_id in ["iron_sword", "steel_sword", "steel_armor"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    items = game_data.load_items("data/items.txt")
+
+    inventory_system.equip_weapon(char, "iron_sword", items['iron_sword'])
+    inventory_system.equip_weapon(char, "steel_sword", items['steel_sword'])
+    inventory_system.equip_armor(char, "steel_armor", items['steel_armor'])
+
+    assert char['strength'] == base['strength'] + 10
+    assert char['max_health'] == base['max_health'] + 25
+    assert "iron_sword" in char['inventory'] and "steel_sword" not in char['inventory']
+    assert inventory_system.get_base_stats(char) == base
+
+    char['health'] = char['max_health']
+    inventory_system.unequip_weapon(char)
+    inventory_system.unequip_armor(char)
+    assert inventory_system.get_base_stats(char) == base
+    assert char['strength'] == base['strength']
+    assert char['health'] == char['max_health'] == base['max_health']
+    assert inventory_system.unequip_armor(char) is None
+
+def test_equipment_and_modifiers_survive_save_and_load():
+    """Test that a saved bonus stays removable after loading, in both formats"""
+    items = game_data.load_items("data/items.txt")
+    for save_format in character_manager.SAVE_FORMATS:
+        char = character_manager.create_character("Keeper", "Warrior")
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+        inventory_system.equip_weapon(char, "iron_sword", items['iron_sword'])
+        inventory_system.add_modifier(char, "blessing", game_data.compile_item_effect("magic:2,strength:1"))
+
+        loaded = character_manager.deserialize_character(
+            character_manager.serialize_character(char, save_format))
+
+        assert loaded['equipped_weapon'] == "iron_sword"
+        assert loaded['strength'] == 21
+        assert inventory_system.get_base_stats(loaded)['strength'] == 15
+        inventory_system.unequip_weapon(loaded)
+        inventory_system.remove_modifier(loaded, "blessing")
+        assert loaded['strength'] == 15 and loaded['magic'] == char['magic'] - 2
+        assert "iron_sword" in loaded['inventory']
+
+def test_health_modifiers_stay_within_bounds():
+    """Test that health buffs cap at max_health and removing them never kills"""
+    char = character_manager.create_character("Healthy", "Cleric")
+    char['health'] = char['max_health'] - 5
+
+    inventory_system.add_modifier(char, "regen", game_data.compile_item_effect("health:20"))
+    assert char['health'] == char['max_health']
+
+    char['health'] = 10
+    inventory_system.remove_modifier(char, "regen")
+    assert char['health'] == 1
+
+def test_saved_modifiers_with_unknown_stats_rejected():
+    """Test that a save naming a stat outside VALID_EFFECT_STATS fails to load"""
+    char = character_manager.create_character("Forged", "Mage")
+    char['modifiers'] = {'blessing': (('luck', 3),)}
+
+    for save_format in character_manager.SAVE_FORMATS:
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.deserialize_character(
+                character_manager.serialize_character(char, save_format))
+
+def test_buff_modifiers_feed_combat():
+    """Test that combat reads stats including active modifiers"""
+    import combat_system
+    char = character_manager.create_character("Buffed", "Rogue")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, enemy)
+    before = battle.calculate_damage(char, enemy)
+
+    inventory_system.add_modifier(char, "rage", game_data.compile_item_effect("strength:7"))
+    assert battle.calculate_damage(char, enemy) == before + 7
+
+    assert inventory_system.remove_modifier(char, "rage") == (("strength", 7),)
+    assert battle.calculate_damage(char, enemy) == before
+    assert inventory_system.remove_modifier(char, "rage") is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])